@@ -0,0 +1,53 @@
+"""
+Microbenchmark: per-request header/URL preparation overhead.
+
+Compares the old per-call header rebuild (plus account_id cookie splitting)
+with the prebuilt request plans used by Sign.
+
+Usage (from the project root):
+    python benchmarks/request_plan.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.config import GAME_CONFIGS
+from src.request_plan import AccountPlan, get_game_plan
+
+COOKIES = 'account_id=12345;cookie_token=xxxxx;ltoken_v2=xxxxx;ltuid_v2=12345;mi18nLang=en-us;_MHYUUID=xxxxx'
+NUMBER = 200_000
+
+
+def legacy_prepare(config):
+    header = {
+        'User-Agent': config.wb_user_agent,
+        'Referer': config.os_referer_url,
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Cookie': COOKIES,
+    }
+    if config.os_headers:
+        header.update(config.os_headers)
+    aid = COOKIES.split('account_id=')[1].split(';')[0]
+    return header, aid
+
+
+def planned_prepare(config, account_plan):
+    return account_plan.headers_for(get_game_plan(config)), account_plan.account_id
+
+
+def main():
+    config = GAME_CONFIGS['ZZZ']
+    account_plan = AccountPlan(COOKIES)
+    assert dict(planned_prepare(config, account_plan)[0]) == legacy_prepare(config)[0]
+
+    for name, fn in (
+        ('legacy', lambda: legacy_prepare(config)),
+        ('planned', lambda: planned_prepare(config, account_plan)),
+    ):
+        best = min(timeit.repeat(fn, number=NUMBER, repeat=5))
+        print(f'{name:>8}: {best / NUMBER * 1e9:8.1f} ns/request')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: concurrent requests over the requests (HTTP/1.1) and httpx (HTTP/2) transports.
+
+Sends the same burst of concurrent GETs through each backend, the way a run
+with MAX_WORKERS > 1 hits one API host, and reports wall time per burst. The
+httpx backend is skipped when its optional dependencies are not installed.
+
+Usage (from the project root):
+    python benchmarks/transports.py [URL] [--requests N] [--concurrency N] [--proxy socks5://host:port]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.transports import TRANSPORTS, create_transport
+
+DEFAULT_URL = 'https://sg-public-api.hoyolab.com/event/luna/zzz/os/home?lang=en-us&act_id=e202406031448091'
+REPEAT = 5
+
+
+def run_burst(transport, url: str, count: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for response in pool.map(lambda _: transport.request('GET', url, 30), range(count)):
+            transport.raise_for_status(response)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('url', nargs='?', default=DEFAULT_URL)
+    parser.add_argument('--requests', type=int, default=20, help='requests per burst')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--proxy', help='e.g. socks5://host:port')
+    args = parser.parse_args()
+    proxy = {'http': args.proxy, 'https': args.proxy} if args.proxy else None
+
+    for name in TRANSPORTS:
+        transport = create_transport(name, proxy, pool_size=args.concurrency)
+        if transport.name != name:
+            print(f'{name:>8}: skipped (not installed)')
+            transport.close()
+            continue
+        try:
+            cold = run_burst(transport, args.url, args.requests, args.concurrency)
+            warm = [run_burst(transport, args.url, args.requests, args.concurrency) for _ in range(REPEAT)]
+        finally:
+            transport.close()
+        print(f'{name:>8}: cold {cold * 1000:8.1f} ms, warm median {statistics.median(warm) * 1000:8.1f} ms '
+              f'per {args.requests} requests')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,7 @@ delay=$((1 + RANDOM % 80))
 LOGFILE="$SCRIPT_DIR/last_job.log"
 
 echo "Waiting for $delay seconds..." > "$LOGFILE"
-sleep "$delay"
 
+# The delay is waited out in Python so DNS and connections can be warmed up meanwhile
 cd "$SCRIPT_DIR/src"
-python3 -m __init__ >> "$LOGFILE" 2>&1
+START_DELAY="$delay" python3 -m __init__ >> "$LOGFILE" 2>&1
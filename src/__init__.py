@@ -5,8 +5,8 @@ __version__ = '2.0.0'
 
 if __name__ == '__main__':
     try:
-        from .checkin import CheckInManager
+        from .checkin import main
     except ImportError:
-        from checkin import CheckInManager
+        from checkin import main
 
-    CheckInManager().run_all()
+    main()
@@ -1,59 +1,189 @@
 """
 Main module for performing daily check-ins.
 """
+import argparse
+import contextvars
 import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Optional, Tuple
 try:
     from .config import (
-        get_proxy_config, load_accounts,
-        GAME_CONFIGS, AccountConfig, GameConfig,
+        get_app_settings, get_proxy_config, load_accounts, ProxyConfig,
+        PROJECT_ROOT, GAME_CONFIGS, AccountConfig, GameConfig,
         GAME_ROW_TEMPLATE, ACCOUNT_HEADER_TEMPLATE,
+        GAME_ROW_VARIABLES, ACCOUNT_HEADER_VARIABLES,
     )
+    from .deadline import Deadline
+    from .endpoints import EndpointSelector, collect_endpoint_groups
+    from .history import RunHistory
+    from .http_cache import HttpCache
     from .http_client import HttpClient
-    from .notify import TelegramNotifier
+    from .log_setup import (
+        log_context, process_log_queue, setup_logging_from_settings, setup_worker_logging,
+    )
+    from .notify import NotificationDispatcher, TelegramNotifier, build_sinks
+    from .profiling import enable as enable_profiling, enable_cprofile, profile_phase, run_profiled
+    from .request_plan import AccountPlan
+    from .scheduler import WorkItem, merge_accounts, order_work, plan_work
     from .sign import Sign, SignResult
+    from .templates import CompiledTemplate
+    from .warmup import TELEGRAM_ORIGIN, collect_origins, install_dns_cache, prefetch_dns
+    from .work_queue import SqliteWorkQueue, WorkQueue, keep_leased
 except ImportError:
     import sys
     import os
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     from src.config import (
-        get_proxy_config, load_accounts,
-        GAME_CONFIGS, AccountConfig, GameConfig,
+        get_app_settings, get_proxy_config, load_accounts, ProxyConfig,
+        PROJECT_ROOT, GAME_CONFIGS, AccountConfig, GameConfig,
         GAME_ROW_TEMPLATE, ACCOUNT_HEADER_TEMPLATE,
+        GAME_ROW_VARIABLES, ACCOUNT_HEADER_VARIABLES,
     )
+    from src.deadline import Deadline
+    from src.endpoints import EndpointSelector, collect_endpoint_groups
+    from src.history import RunHistory
+    from src.http_cache import HttpCache
     from src.http_client import HttpClient
-    from src.notify import TelegramNotifier
+    from src.log_setup import (
+        log_context, process_log_queue, setup_logging_from_settings, setup_worker_logging,
+    )
+    from src.notify import NotificationDispatcher, TelegramNotifier, build_sinks
+    from src.profiling import enable as enable_profiling, enable_cprofile, profile_phase, run_profiled
+    from src.request_plan import AccountPlan
+    from src.scheduler import WorkItem, merge_accounts, order_work, plan_work
     from src.sign import Sign, SignResult
+    from src.templates import CompiledTemplate
+    from src.warmup import TELEGRAM_ORIGIN, collect_origins, install_dns_cache, prefetch_dns
+    from src.work_queue import SqliteWorkQueue, WorkQueue, keep_leased
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S',
-)
+setup_logging_from_settings(get_app_settings())
 
 logger = logging.getLogger(__name__)
 
 
-class _SafeDict(dict):
-    """dict subclass that leaves unknown format keys in place instead of raising."""
-    def __missing__(self, key: str) -> str:
-        return '{' + key + '}'
+# Seconds between claim attempts while other workers still hold leases
+QUEUE_POLL_INTERVAL = 1.0
+
+_GAME_ROW = CompiledTemplate(GAME_ROW_TEMPLATE, GAME_ROW_VARIABLES)
+_ACCOUNT_HEADER = CompiledTemplate(ACCOUNT_HEADER_TEMPLATE, ACCOUNT_HEADER_VARIABLES)
+
+
+class _ChatDigest:
+    """
+    Per-chat message buffers, filled one account block at a time as results
+    arrive. Blocks are kept with their account's configured slot and sent in
+    that order, whatever order the accounts finished in.
+    """
 
+    def __init__(self, default_chat_id: Optional[str]):
+        self.default_chat_id = default_chat_id
+        self.date = datetime.now().strftime('%d.%m.%Y')
+        self.blocks_by_chat: Dict[Optional[str], List[Tuple[int, str]]] = {}
+        self.total_success = 0
+        self.total_games = 0
 
-def _fmt(template: str, **kwargs) -> str:
-    return template.format_map(_SafeDict(kwargs))
+    def add(self, slot: int, account: AccountConfig, results: List[SignResult]):
+        if not results:
+            return
+        # Accounts without a Telegram chat are still reported to webhook / file sinks
+        chat_id = account.telegram_chat_id or self.default_chat_id
+        self.total_success += sum(1 for r in results if r.success)
+        self.total_games += len(results)
+        with profile_phase('render'):
+            block = CheckInManager._format_account_block(account.account_id, results, self.date)
+        self.blocks_by_chat.setdefault(chat_id, []).append((slot, block))
+
+    def messages(self) -> Dict[Optional[str], str]:
+        """Chat id -> message text, chats and blocks in configured account order."""
+        ordered = sorted(self.blocks_by_chat.items(), key=lambda chat: min(chat[1])[0])
+        return {chat_id: '\n\n'.join(block for _, block in sorted(blocks)) for chat_id, blocks in ordered}
+
+    @property
+    def overall_status(self) -> str:
+        return f"Total: {self.total_success}/{self.total_games} succeeded"
 
 
 class CheckInManager:
     """Orchestrates check-ins across all configured accounts and games."""
 
-    def __init__(self):
-        self.telegram = TelegramNotifier()
-        self.accounts = load_accounts()
-        self._signin_proxy = get_proxy_config().get_signin_proxy()
+    def __init__(self, signin_proxy: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            signin_proxy: Proxy dict for sign-in traffic; defaults to the configured one.
+        """
+        with profile_phase('config'):
+            self.telegram = TelegramNotifier()
+            self.notifier = NotificationDispatcher(build_sinks(self.telegram), get_app_settings().notify_workers)
+            self.accounts = merge_accounts(load_accounts(), get_app_settings().default_chat_id)
+            self._signin_proxy = signin_proxy or get_proxy_config().get_signin_proxy()
+            settings = get_app_settings()
+            self._http_cache = (
+                HttpCache(settings.http_cache_dir, settings.http_cache_max_entries, settings.http_cache_ttl)
+                if settings.http_cache_enabled
+                else None
+            )
+            self.deadline = self.make_deadline()
+            self.endpoints = self._make_endpoint_selector()
+            # One pooled client for all sign-in traffic so connections are reused across pairs
+            self.http_client = HttpClient(
+                proxy=self._signin_proxy,
+                cache=self._http_cache,
+                deadline=self.deadline,
+                transport=settings.http_transport,
+                http2=settings.http2_enabled,
+                endpoints=self.endpoints,
+            )
+            self.history = RunHistory(settings.history_file).load() if settings.history_enabled else None
+            # Shared by scheduled runs and on-demand requests from the control API
+            self.pool = ThreadPoolExecutor(max_workers=settings.max_workers, thread_name_prefix='checkin')
+            self._account_plans: Dict[str, AccountPlan] = {}
+            self._state_lock = threading.Lock()
+            self.in_progress: Dict[Tuple[str, str], float] = {}
+            self.last_results: Dict[Tuple[str, str], SignResult] = {}
+            self.counters: Dict[str, float] = {
+                'pairs_total': 0, 'pairs_succeeded': 0, 'pairs_failed': 0, 'pairs_skipped': 0, 'pair_seconds_total': 0.0,
+            }
+            _GAME_ROW.validate('GAME_ROW_TEMPLATE')
+            _ACCOUNT_HEADER.validate('ACCOUNT_HEADER_TEMPLATE')
         logger.info(f"Loaded {len(self.accounts)} account(s)")
 
+    @staticmethod
+    def make_deadline() -> Deadline:
+        """
+        Deadline for a new run: it must finish before the daily reset, and within
+        RUN_TIME_LIMIT if set. Every run (scheduled, on-demand or queued) gets its own.
+        """
+        settings = get_app_settings()
+        deadline = Deadline.before_reset(settings.reset_margin)
+        if settings.run_time_limit and settings.run_time_limit < deadline.budget:
+            deadline = Deadline(settings.run_time_limit)
+        logger.info(f"Run deadline in {deadline.budget:.0f}s")
+        return deadline
+
+    def _make_endpoint_selector(self) -> Optional[EndpointSelector]:
+        """Selector for the mirrored API hosts of the enabled games, if there are any."""
+        settings = get_app_settings()
+        enabled_games = {g for account in self.accounts for g in account.enabled_games}
+        groups = collect_endpoint_groups({n: c for n, c in GAME_CONFIGS.items() if n in enabled_games})
+        if not settings.endpoint_selection or not groups:
+            return None
+        return EndpointSelector(groups, settings.endpoint_state_file, settings.endpoint_probe_interval).load()
+
+    def _probe_endpoints(self):
+        """Re-probe mirrored API hosts whose last probe is older than ENDPOINT_PROBE_INTERVAL."""
+        if self.endpoints is None or not self.endpoints.stale_groups():
+            return
+        with profile_phase('probe'):
+            probed = self.endpoints.probe(self.http_client.transport, get_app_settings().endpoint_probe_timeout)
+        logger.info(f"Probed {probed} API host(s) for endpoint selection")
+        self.endpoints.save()
+
     # ── Check-in execution ────────────────────────────────────────────────────
 
     def run_check_in_for_game(
@@ -61,12 +191,13 @@ class CheckInManager:
         game_name: str,
         game_config: GameConfig,
         account: AccountConfig,
+        account_plan: Optional[AccountPlan] = None,
+        deadline: Optional[Deadline] = None,
     ) -> SignResult:
         """Perform check-in for a single game / account pair."""
         logger.info(f'Starting check-in: {game_name} / account {account.account_id}')
         try:
-            http_client = HttpClient(proxy=self._signin_proxy)
-            return Sign(account.cookies, game_name, game_config, http_client).run()
+            return Sign(account.cookies, game_name, game_config, self.http_client, account_plan, deadline).run()
 
         except IndexError:
             cookie_fields = ["account_id", "cookie_token", "ltoken", "ltuid"]
@@ -82,15 +213,204 @@ class CheckInManager:
             logger.error(f"{game_name} / account {account.account_id}: {e}")
             return SignResult(game=game_name, success=False, status=f'Error: {e}')
 
+    def _skip_result(self, item: WorkItem, deadline: Deadline) -> Optional[SignResult]:
+        """The result to report instead of running a pair (deadline reached / already signed), if any."""
+        account, game_name = item.account, item.game_name
+        settings = get_app_settings()
+        if deadline.remaining() < settings.min_pair_time:
+            logger.warning(f"Run deadline reached — not starting {game_name} / account {account.account_id}")
+            with self._state_lock:
+                self.counters['pairs_skipped'] += 1
+            return SignResult(game=game_name, success=False, status='Skipped: run deadline reached')
+
+        if settings.skip_signed_pairs and self.history is not None \
+                and self.history.signed_today(account.account_id, game_name):
+            last = self.history.last_result(account.account_id, game_name)
+            if last is not None:
+                logger.info(f"Skipping {game_name} / account {account.account_id}: already signed in today")
+                with self._state_lock:
+                    self.counters['pairs_skipped'] += 1
+                last.status = 'Already done!'
+                return last
+        return None
+
+    def run_work_item(
+        self,
+        item: WorkItem,
+        account_plan: Optional[AccountPlan] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> SignResult:
+        """
+        Run one planned pair, honouring the deadline of its run (default: the
+        scheduled run's) and recording it in the history.
+        """
+        deadline = deadline or self.deadline
+        return self._skip_result(item, deadline) or self._run_pair(item, account_plan, deadline)[0]
+
+    def _run_pair(
+        self,
+        item: WorkItem,
+        account_plan: Optional[AccountPlan],
+        deadline: Deadline,
+    ) -> Tuple[SignResult, float]:
+        """Check in one pair, updating live state, counters and history. Returns (result, duration)."""
+        account, game_name = item.account, item.game_name
+        pair = (account.account_id, game_name)
+        started = time.monotonic()
+        with self._state_lock:
+            self.in_progress[pair] = time.time()
+        try:
+            with log_context(account=account.account_id, game=game_name):
+                result = self.run_check_in_for_game(game_name, item.game_config, account, account_plan, deadline)
+        finally:
+            with self._state_lock:
+                self.in_progress.pop(pair, None)
+        duration = time.monotonic() - started
+
+        with self._state_lock:
+            self.last_results[pair] = result
+            self.counters['pairs_total'] += 1
+            self.counters['pairs_succeeded' if result.success else 'pairs_failed'] += 1
+            self.counters['pair_seconds_total'] += duration
+        if self.history is not None:
+            self.history.record(account.account_id, game_name, result, duration)
+        return result, duration
+
+    def _account_plan(self, account: AccountConfig) -> AccountPlan:
+        with self._state_lock:
+            plan = self._account_plans.get(account.cookies)
+            if plan is None:
+                plan = self._account_plans[account.cookies] = AccountPlan(account.cookies)
+            return plan
+
+    def run_items(
+        self,
+        items: List[WorkItem],
+        digest: Optional['_ChatDigest'] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Tuple[WorkItem, SignResult]]:
+        """
+        Run planned pairs on the worker pool in history-aware order, within
+        deadline (default: the scheduled run's).
+
+        Each account's block is rendered into digest as soon as its last pair
+        finishes and sent in the account's configured position.
+        Returns (item, result) pairs in planned order.
+        """
+        deadline = deadline or self.deadline
+        position = {id(item): i for i, item in enumerate(items)}
+        pending: Dict[int, int] = {}
+        slot: Dict[int, int] = {}
+        for i, item in enumerate(items):
+            pending[id(item.account)] = pending.get(id(item.account), 0) + 1
+            slot.setdefault(id(item.account), i)
+        account_results: Dict[int, List[Tuple[int, SignResult]]] = {}
+        results: List[Optional[SignResult]] = [None] * len(items)
+
+        futures = {
+            self.pool.submit(
+                contextvars.copy_context().run, run_profiled,
+                self.run_work_item, item, self._account_plan(item.account), deadline,
+            ): item
+            for item in order_work(items, self.history)
+        }
+        for future in as_completed(futures):
+            item = futures[future]
+            result = future.result()
+            results[position[id(item)]] = result
+            key = id(item.account)
+            account_results.setdefault(key, []).append((position[id(item)], result))
+
+            pending[key] -= 1
+            if not pending[key] and digest is not None:
+                # Account complete — render its block now, games in configured order
+                results_in_order = [r for _, r in sorted(account_results.pop(key), key=lambda p: p[0])]
+                digest.add(slot[key], item.account, results_in_order)
+
+        if self.history is not None:
+            self.history.save()
+        if self.endpoints is not None:
+            self.endpoints.save()
+        return list(zip(items, results))
+
+    def run_on_demand(
+        self,
+        items: List[WorkItem],
+        notify: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> List[Tuple[WorkItem, SignResult]]:
+        """
+        Run a subset of pairs as its own run, optionally notifying their chats.
+        Without a deadline the run gets a fresh one; concurrent runs never share it.
+        """
+        deadline = deadline or self.make_deadline()
+        self._probe_endpoints()
+        digest = _ChatDigest(self.telegram.config.default_chat_id) if notify else None
+        results = self.run_items(items, digest, deadline)
+        if digest is not None:
+            self._send_notifications(digest)
+        return results
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Consistent copy of live progress, last results and counters."""
+        with self._state_lock:
+            return {
+                'in_progress': dict(self.in_progress),
+                'last_results': dict(self.last_results),
+                'counters': dict(self.counters),
+            }
+
     def run_check_in_for_account(self, account: AccountConfig) -> List[SignResult]:
         """Perform check-in for all enabled games on an account."""
-        results = []
-        for game_name in account.enabled_games:
-            if game_name not in GAME_CONFIGS:
-                logger.warning(f"Unknown game '{game_name}' — skipping.")
-                continue
-            results.append(self.run_check_in_for_game(game_name, GAME_CONFIGS[game_name], account))
-        return results
+        account_plan = self._account_plan(account)
+        return [self.run_work_item(item, account_plan) for item in plan_work([account])]
+
+    def _wait_start_delay(self, delay: float):
+        """
+        Sleep through the start delay, using its final seconds to probe mirrored
+        API hosts, pre-resolve DNS and open pooled connections to every host the
+        run will talk to.
+        """
+        settings = get_app_settings()
+        if not settings.warmup_enabled:
+            if delay > 0:
+                logger.info(f"Waiting {delay:.0f}s before starting...")
+                with profile_phase('sleep'):
+                    time.sleep(delay)
+            self._probe_endpoints()
+            return
+
+        install_dns_cache(settings.dns_cache_ttl)
+        enabled_games = {g for account in self.accounts for g in account.enabled_games}
+        game_origins = collect_origins(
+            {name: cfg for name, cfg in GAME_CONFIGS.items() if name in enabled_games},
+            include_telegram=False,
+        )
+        telegram_enabled = bool(self.telegram.config.bot_token and self.telegram.config.enable_notifications)
+
+        # Warm up late in the delay so pooled connections aren't idled out by the server
+        lead = min(delay, settings.warmup_lead)
+        if delay > lead:
+            logger.info(f"Waiting {delay:.0f}s before starting...")
+            with profile_phase('sleep'):
+                time.sleep(delay - lead)
+        warm_deadline = time.monotonic() + lead
+
+        self._probe_endpoints()
+        if self.endpoints is not None:
+            # Warm the hosts requests will actually be routed to
+            game_origins = list(dict.fromkeys(self.endpoints.route(o) for o in game_origins))
+        with profile_phase('warmup'):
+            prefetch_dns(game_origins + ([TELEGRAM_ORIGIN] if telegram_enabled else []))
+            warmed = self.http_client.warm_up(game_origins)
+            if telegram_enabled:
+                self.telegram.http_client.warm_up([TELEGRAM_ORIGIN])
+        logger.info(f"Warmed up connections to {warmed}/{len(game_origins)} game API host(s)")
+
+        remaining = warm_deadline - time.monotonic()
+        if remaining > 0:
+            with profile_phase('sleep'):
+                time.sleep(remaining)
 
     def run_all(self):
         """Perform check-in for every account, then send consolidated notifications."""
@@ -98,39 +418,152 @@ class CheckInManager:
             logger.error("No accounts found. Please check your configuration.")
             return
 
-        all_results = []
-        for account in self.accounts:
-            logger.info(f"Processing account: {account.account_id}")
-            all_results.append({
-                'account_id': account.account_id,
-                'telegram_chat_id': account.telegram_chat_id,
-                'results': self.run_check_in_for_account(account),
-            })
+        settings = get_app_settings()
+        # Never let the start delay eat into the time needed for the first pair
+        start_delay = min(settings.start_delay, max(0.0, self.deadline.remaining() - settings.min_pair_time))
+        self._wait_start_delay(start_delay)
+
+        digest = _ChatDigest(self.telegram.config.default_chat_id)
+        self.run_items(plan_work(self.accounts), digest)
+        self._send_notifications(digest)
+
+    # ── Work-queue mode ───────────────────────────────────────────────────────
+
+    def _worker_proxies(self, workers: int) -> List[Optional[Dict[str, str]]]:
+        """Sign-in proxy per worker: QUEUE_WORKER_PROXIES round-robin, else the configured proxy."""
+        addresses = [a.strip() for a in (get_app_settings().queue_worker_proxies or '').split(',') if a.strip()]
+        if not addresses:
+            return [self._signin_proxy] * workers
+        return [
+            ProxyConfig(use_proxy_signin=True, proxy_data=addresses[i % len(addresses)]).get_signin_proxy()
+            for i in range(workers)
+        ]
+
+    def run_queued(self, workers: int):
+        """
+        Perform check-in through the durable work queue: the pairs are enqueued in
+        history-aware order, checked in by worker processes, and their results
+        are read back from the queue for the notifications.
+        """
+        if not self.accounts:
+            logger.error("No accounts found. Please check your configuration.")
+            return
+
+        settings = get_app_settings()
+        start_delay = min(settings.start_delay, max(0.0, self.deadline.remaining() - settings.min_pair_time))
+        if start_delay > 0:
+            # No warm-up here: each worker process opens its own connections
+            logger.info(f"Waiting {start_delay:.0f}s before starting...")
+            with profile_phase('sleep'):
+                time.sleep(start_delay)
+        # Workers load the saved choice instead of probing themselves
+        self._probe_endpoints()
+
+        planned = plan_work(self.accounts)
+        ordered = order_work(planned, self.history)
+        queue = SqliteWorkQueue(settings.queue_db, settings.queue_max_attempts)
+        run_id = uuid.uuid4().hex[:12]
+        queue.enqueue(run_id, ordered)
+        logger.info(f"Enqueued {len(ordered)} pair(s) as run {run_id} for {workers} worker process(es)")
+
+        # Workers share this run's deadline (as wall-clock time, monotonic clocks are per process)
+        deadline_at = time.time() + self.deadline.remaining()
+        context = multiprocessing.get_context('spawn')
+        # Workers log through this process, so the rotating log files have a single writer
+        with process_log_queue(context) as log_queue:
+            processes = [
+                context.Process(
+                    target=run_queue_worker,
+                    args=(settings.queue_db, run_id, f'worker-{i + 1}', proxy, deadline_at, log_queue),
+                    name=f'checkin-worker-{i + 1}',
+                )
+                for i, proxy in enumerate(self._worker_proxies(workers))
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join(max(0.0, self.deadline.remaining()) + settings.queue_lease)
+                if process.is_alive():
+                    logger.error(f"{process.name} did not finish before the run deadline — terminating it")
+                    process.terminate()
+                    process.join()
+
+        queue.abandon(run_id, 'Error: not processed by any worker')
+        results = queue.results(run_id)
+        by_item = {id(item): results[position] for position, item in enumerate(ordered)}
+
+        digest = _ChatDigest(self.telegram.config.default_chat_id)
+        account_results: Dict[int, List[SignResult]] = {}
+        for item in planned:
+            result, duration = by_item[id(item)]
+            account_results.setdefault(id(item.account), []).append(result)
+            with self._state_lock:
+                self.last_results[(item.account.account_id, item.game_name)] = result
+            # Pairs the workers skipped (duration None) weren't run, so aren't history
+            if self.history is not None and duration is not None:
+                self.history.record(item.account.account_id, item.game_name, result, duration)
+        for i, account in enumerate(self.accounts):
+            digest.add(i, account, account_results.get(id(account), []))
+        if self.history is not None:
+            self.history.save()
+        self._send_notifications(digest)
+
+    def run_queue_jobs(self, queue: WorkQueue, run_id: str, worker_id: str, deadline: Deadline):
+        """Claim and check in jobs of a run on this worker's pool until the run has no work left."""
+        settings = get_app_settings()
+        accounts = {a.account_id: a for a in self.accounts}
 
-        self._send_notifications(all_results)
+        def claim_loop():
+            while True:
+                job = queue.claim(run_id, worker_id, settings.queue_lease)
+                if job is None:
+                    if not queue.unfinished(run_id):
+                        return
+                    # Others still hold leases; wait in case one of them expires
+                    time.sleep(QUEUE_POLL_INTERVAL)
+                    continue
+                account = accounts.get(job.account_id)
+                if account is None or job.game not in GAME_CONFIGS:
+                    logger.error(f"{worker_id}: {job.game} / account {job.account_id} is not configured here")
+                    queue.complete(job, SignResult(game=job.game, success=False, status='Error: account not configured'))
+                    continue
+                item = WorkItem(account, job.game, GAME_CONFIGS[job.game])
+                skipped = self._skip_result(item, deadline)
+                if skipped is not None:
+                    queue.complete(job, skipped)
+                else:
+                    with keep_leased(queue, job, worker_id, settings.queue_lease):
+                        outcome = self._run_pair(item, self._account_plan(account), deadline)
+                    queue.complete(job, *outcome)
+
+        loops = [
+            self.pool.submit(contextvars.copy_context().run, run_profiled, claim_loop)
+            for _ in range(settings.max_workers)
+        ]
+        for loop in loops:
+            loop.result()
 
     # ── Message formatting ────────────────────────────────────────────────────
 
     @staticmethod
     def _format_game_row(result: SignResult) -> str:
         """Format one game entry using GAME_ROW_TEMPLATE."""
-        return _fmt(
-            GAME_ROW_TEMPLATE,
-            game=result.game,
-            player_name=result.player_name,
-            uid=result.uid,
-            ar=result.ar,
-            level=result.ar,
-            region=result.region,
-            day=result.day,
-            reward_name=result.reward_name,
-            reward_count=result.reward_count,
-            status=result.status,
-            status_icon=result.status_icon,
-        )
+        return _GAME_ROW.render({
+            'game': result.game,
+            'player_name': result.player_name,
+            'uid': result.uid,
+            'ar': result.ar,
+            'level': result.ar,
+            'region': result.region,
+            'day': result.day,
+            'reward_name': result.reward_name,
+            'reward_count': result.reward_count,
+            'status': result.status,
+            'status_icon': result.status_icon,
+        })
 
     @staticmethod
-    def _format_account_block(account_id: str, results: List[SignResult]) -> str:
+    def _format_account_block(account_id: str, results: List[SignResult], date: Optional[str] = None) -> str:
         """
         Build an expandable <blockquote> for one account.
 
@@ -141,53 +574,117 @@ class CheckInManager:
           ...game rows...
         """
         success_count = sum(1 for r in results if r.success)
-        total_count = len(results)
         status_icons = ' '.join(r.status_icon for r in results)
-        date = datetime.now().strftime('%d.%m.%Y')
-
-        header = _fmt(
-            ACCOUNT_HEADER_TEMPLATE,
-            account_id=account_id,
-            success_count=success_count,
-            total_count=total_count,
-            status_icons=status_icons,
-            date=date,
-        )
+
+        header = _ACCOUNT_HEADER.render({
+            'account_id': account_id,
+            'success_count': success_count,
+            'total_count': len(results),
+            'status_icons': status_icons,
+            'date': date or datetime.now().strftime('%d.%m.%Y'),
+        })
 
         game_rows = '\n\n'.join(CheckInManager._format_game_row(r) for r in results)
-        body = f"{header}\n{status_icons}\n\n{game_rows}"
-        return f"<blockquote expandable>{body}</blockquote>"
+        return f"<blockquote expandable>{header}\n{status_icons}\n\n{game_rows}</blockquote>"
 
     # ── Notification dispatch ─────────────────────────────────────────────────
 
-    def _send_notifications(self, all_results: List[Dict[str, Any]]):
-        """Group results by chat_id and send one message per chat."""
-        notifications_by_chat: Dict[str, List[str]] = {}
-        total_success = 0
-        total_games = 0
+    def _send_notifications(self, digest: _ChatDigest):
+        """Send one message per chat from the digest's pre-rendered blocks to every sink."""
+        messages = [
+            {'chat_id': chat_id, 'app': 'HoyoSignIn', 'status': digest.overall_status, 'msg': msg}
+            for chat_id, msg in digest.messages().items()
+        ]
+        with profile_phase('notify'):
+            self.notifier.dispatch(messages)
 
-        for account_result in all_results:
-            sign_results: List[SignResult] = account_result['results']
-            if not sign_results:
-                continue
 
-            account_id = account_result['account_id']
-            chat_id = account_result.get('telegram_chat_id') or self.telegram.config.default_chat_id
-            if not chat_id:
-                continue
+def run_queue_worker(db_path: str, run_id: str, worker_id: str,
+                     proxy: Optional[Dict[str, str]], deadline_at: float, log_queue):
+    """Entry point of a work-queue worker process (started by CheckInManager.run_queued)."""
+    setup_worker_logging(log_queue, get_app_settings().log_level)
+    manager = CheckInManager(signin_proxy=proxy)
+    deadline = Deadline(max(0.0, deadline_at - time.time()))
+    # The coordinator records results in the run history; this copy is only read
+    queue = SqliteWorkQueue(db_path, get_app_settings().queue_max_attempts)
+    manager.run_queue_jobs(queue, run_id, worker_id, deadline)
+    manager.http_client.close()
 
-            total_success += sum(1 for r in sign_results if r.success)
-            total_games += len(sign_results)
 
-            block = self._format_account_block(account_id, sign_results)
-            notifications_by_chat.setdefault(chat_id, []).append(block)
+# ── Command line ──────────────────────────────────────────────────────────────
 
-        overall_status = f"Total: {total_success}/{total_games} succeeded"
+def main(argv: Optional[List[str]] = None):
+    """Command-line entry point (python -m __init__ from src/)."""
+    parser = argparse.ArgumentParser(prog='HoyoSignIn', description='Daily check-in for HoYoverse games.')
+    parser.add_argument('--profile', action='store_true',
+                        help='time each run phase per game and write a report at the end')
+    parser.add_argument('--profile-output', default=None,
+                        help='report path; a .json suffix writes JSON (default: <project>/profile_report.txt)')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='with --profile, also run under cProfile and dump <output>.prof')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='with --profile, also record allocations per phase')
+    parser.add_argument('--serve', action='store_true',
+                        help='run the local control API instead of a one-off check-in run')
+    parser.add_argument('--queue-workers', type=int, metavar='N', default=None,
+                        help='check in through the work queue with N worker processes (default: QUEUE_WORKERS)')
+    args = parser.parse_args(argv)
 
-        for chat_id, blocks in notifications_by_chat.items():
-            self.telegram.send(
-                chat_id=chat_id,
-                app='HoyoSignIn',
-                status=overall_status,
-                msg='\n\n'.join(blocks),
-            )
+    profile_options = [name for name, given in (
+        ('--cprofile', args.cprofile),
+        ('--tracemalloc', args.tracemalloc),
+        ('--profile-output', args.profile_output is not None),
+    ) if given]
+    if args.serve:
+        # The control API runs its check-ins in process and is never profiled
+        conflicting = ['--profile'] * args.profile + profile_options
+        if args.queue_workers is not None:
+            conflicting.append('--queue-workers')
+        if conflicting:
+            parser.error(f"--serve cannot be combined with {', '.join(conflicting)}")
+    elif profile_options and not args.profile:
+        parser.error(f"{', '.join(profile_options)} only applies with --profile")
+    if args.queue_workers is not None and args.queue_workers < 0:
+        parser.error('--queue-workers must be 0 or more')
+    if args.queue_workers is None:
+        args.queue_workers = get_app_settings().queue_workers
+    if args.profile and args.queue_workers > 0:
+        # The profiler only sees this process, not the queue's worker processes
+        parser.error(f'--profile runs in a single process; it cannot profile {args.queue_workers} queue '
+                     f'worker(s) (QUEUE_WORKERS / --queue-workers) — pass --queue-workers 0')
+    if args.profile_output is None:
+        args.profile_output = os.path.join(PROJECT_ROOT, 'profile_report.txt')
+
+    if args.serve:
+        try:
+            from .control_api import ControlServer
+        except ImportError:
+            from src.control_api import ControlServer
+        settings = get_app_settings()
+        ControlServer(
+            CheckInManager(),
+            settings.control_api_host,
+            settings.control_api_port,
+            settings.control_api_token,
+        ).serve_forever()
+        return
+
+    if args.queue_workers > 0:
+        CheckInManager().run_queued(args.queue_workers)
+        return
+
+    if not args.profile:
+        CheckInManager().run_all()
+        return
+
+    profiler = enable_profiling(trace_memory=args.tracemalloc)
+    cprofiler = enable_cprofile() if args.cprofile else None
+    try:
+        CheckInManager().run_all()
+    finally:
+        if cprofiler:
+            cprofiler.disable()
+        profiler.finish()
+        profiler.write_report(args.profile_output)
+        if cprofiler:
+            cprofiler.write(os.path.splitext(args.profile_output)[0] + '.prof')
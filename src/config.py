@@ -16,6 +16,12 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Endpoint classes whose GET responses may be served from the HTTP cache.
+# Check-in info and the sign POST change every day and are never cached.
+CACHEABLE_ENDPOINTS = ('reward', 'role')
+
 
 class GameConfig(BaseModel):
     """Configuration for a specific game."""
@@ -29,6 +35,10 @@ class GameConfig(BaseModel):
     os_sign_url: str
     wb_user_agent: str = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0'
     os_headers: Dict[str, str] = Field(default_factory=dict)
+    cache_endpoints: List[str] = Field(default_factory=lambda: ['reward'])
+    # Equivalent hosts per API origin, e.g.
+    # {'https://sg-public-api.hoyolab.com': ['https://mirror.example.com']}
+    mirrors: Dict[str, List[str]] = Field(default_factory=dict)
 
     @validator('os_headers', pre=True)
     def parse_headers(cls, v):
@@ -36,6 +46,21 @@ class GameConfig(BaseModel):
             return {}
         return v or {}
 
+    @validator('cache_endpoints')
+    def validate_cache_endpoints(cls, v):
+        unknown = [e for e in v if e not in CACHEABLE_ENDPOINTS]
+        if unknown:
+            raise ValueError(f"Unknown cache endpoint(s): {', '.join(unknown)}")
+        return v
+
+    @validator('mirrors')
+    def validate_mirrors(cls, v):
+        for origin in [o for primary, mirrors in v.items() for o in [primary, *mirrors]]:
+            scheme, _, rest = origin.partition('://')
+            if scheme not in ('http', 'https') or not rest or '/' in rest:
+                raise ValueError(f"Mirror '{origin}' must be an origin like https://host[:port]")
+        return v
+
 
 class AccountConfig(BaseModel):
     """Configuration for a single account."""
@@ -43,6 +68,8 @@ class AccountConfig(BaseModel):
     cookies: str
     telegram_chat_id: Optional[str] = None
     enabled_games: List[str] = Field(default_factory=lambda: ['Genshin', 'HSR', 'HI3', 'ToT', 'ZZZ'])
+    # Loaded from an old-style OS_COOKIE_<GAME> variable
+    legacy: bool = False
 
     @validator('cookies')
     def validate_cookies(cls, v):
@@ -104,6 +131,77 @@ class AppSettings(BaseSettings):
       USE_PROXY_SIGNIN    — true/false, route game sign-in calls through the proxy
       USE_PROXY_TELEGRAM  — true/false, route Telegram notification calls through the proxy
       USE_PROXY           — true/false, legacy flag that enables proxy for BOTH channels
+
+    HTTP cache env vars:
+      HTTP_CACHE_ENABLED     — true/false, cache mostly-static responses (default true)
+      HTTP_CACHE_DIR         — cache directory (default <project>/.cache/http)
+      HTTP_CACHE_MAX_ENTRIES — LRU bound on stored responses (default 256)
+      HTTP_CACHE_TTL         — seconds to trust a response without revalidating
+                               when the server sends no Cache-Control (default 0)
+
+    HTTP transport env vars:
+      HTTP_TRANSPORT — requests | httpx; httpx multiplexes concurrent sign-in
+                       requests to each host over one HTTP/2 connection and needs
+                       pip install "httpx[http2,socks]" (default requests)
+      HTTP2_ENABLED  — true/false, negotiate HTTP/2 with the httpx transport (default true)
+
+    Endpoint selection env vars (games with GameConfig.mirrors):
+      ENDPOINT_SELECTION      — true/false, route requests to the fastest healthy
+                                mirror (default true)
+      ENDPOINT_STATE_FILE     — probe results / choices (default <project>/.cache/endpoints.json)
+      ENDPOINT_PROBE_INTERVAL — seconds before mirrors are probed again (default 21600)
+      ENDPOINT_PROBE_TIMEOUT  — per-probe timeout in seconds (default 5)
+
+    Start-up env vars:
+      START_DELAY    — seconds to wait before signing in (set by run.sh / run.bat)
+      WARMUP_ENABLED — true/false, pre-resolve DNS and open connections during the delay
+      WARMUP_LEAD    — how many seconds before the delay ends to start warming up
+      DNS_CACHE_TTL  — seconds to reuse resolved addresses (default 300)
+
+    Deadline env vars:
+      RUN_TIME_LIMIT — overall run budget in seconds (default: until the reset)
+      RESET_MARGIN   — finish this many seconds before the 00:00 UTC+8 reset (default 30)
+      MIN_PAIR_TIME  — don't start a game / account pair with less time left (default 5)
+
+    Scheduling env vars:
+      HISTORY_ENABLED   — true/false, order pairs using past runs (default true)
+      HISTORY_FILE      — run history location (default <project>/.cache/history.json)
+      SKIP_SIGNED_PAIRS — true/false, don't re-check pairs already signed in today
+                          (their last result is reported instead; default false)
+      MAX_WORKERS       — game / account pairs checked in concurrently (default 1)
+
+    Work-queue env vars (multi-process runs):
+      QUEUE_WORKERS        — check in through the work queue with this many worker
+                             processes (default 0: in-process, see MAX_WORKERS)
+      QUEUE_DB             — SQLite queue location (default <project>/.cache/queue.sqlite3)
+      QUEUE_LEASE          — seconds without a heartbeat (sent every third of it)
+                             before another worker takes a job over (default 120)
+      QUEUE_MAX_ATTEMPTS   — leases per job before it is failed (default 3)
+      QUEUE_WORKER_PROXIES — comma-separated SOCKS5 addresses assigned round-robin
+                             to the workers (default: the sign-in proxy for all)
+
+    Notification env vars:
+      NOTIFY_WEBHOOK_URLS   — comma-separated webhook URLs (Discord, Slack or generic JSON)
+      NOTIFY_WEBHOOK_FORMAT — discord | slack | json (default: detected from the URL)
+      NOTIFY_FILE           — append every message as a JSON line to this file
+      NOTIFY_TIMEOUT        — seconds to wait for each webhook / file sink (default 15)
+      NOTIFY_TELEGRAM_TIMEOUT — seconds to wait for Telegram (default 120: the
+                              client's 4 attempts × 30 s, so slow sends still land)
+      NOTIFY_WORKERS        — concurrent deliveries per sink (default 4)
+
+    Logging env vars:
+      LOG_LEVEL        — DEBUG | INFO | WARNING | ERROR (default INFO)
+      LOG_DIR          — directory for hoyosignin.log / errors.log (default <project>/logs;
+                         empty logs to the console only)
+      LOG_FORMAT       — text | json (log files only)
+      LOG_ROTATION     — size | time (daily)
+      LOG_MAX_BYTES    — size limit per file for size rotation (default 5 MiB)
+      LOG_BACKUP_COUNT — rotated files to keep (default 7)
+
+    Control API env vars (--serve):
+      CONTROL_API_HOST  — bind address (default 127.0.0.1; keep it local)
+      CONTROL_API_PORT  — port (default 8765)
+      CONTROL_API_TOKEN — optional bearer token required on every request
     """
     user_agent: Optional[str] = None
     proxy_data: Optional[str] = None
@@ -112,6 +210,47 @@ class AppSettings(BaseSettings):
     use_proxy: bool = False  # legacy: enables proxy for both channels
     bot_token: Optional[str] = None
     default_chat_id: Optional[str] = None
+    http_cache_enabled: bool = True
+    http_cache_dir: str = os.path.join(PROJECT_ROOT, '.cache', 'http')
+    http_cache_max_entries: int = 256
+    http_cache_ttl: int = 0
+    http_transport: str = 'requests'
+    http2_enabled: bool = True
+    endpoint_selection: bool = True
+    endpoint_state_file: str = os.path.join(PROJECT_ROOT, '.cache', 'endpoints.json')
+    endpoint_probe_interval: float = 21600
+    endpoint_probe_timeout: float = 5
+    start_delay: float = 0
+    warmup_enabled: bool = True
+    warmup_lead: float = 10
+    dns_cache_ttl: int = 300
+    run_time_limit: Optional[float] = None
+    reset_margin: float = 30
+    min_pair_time: float = 5
+    history_enabled: bool = True
+    history_file: str = os.path.join(PROJECT_ROOT, '.cache', 'history.json')
+    skip_signed_pairs: bool = False
+    max_workers: int = 1
+    queue_workers: int = 0
+    queue_db: str = os.path.join(PROJECT_ROOT, '.cache', 'queue.sqlite3')
+    queue_lease: float = 120
+    queue_max_attempts: int = 3
+    queue_worker_proxies: Optional[str] = None
+    notify_webhook_urls: Optional[str] = None
+    notify_webhook_format: Optional[str] = None
+    notify_file: Optional[str] = None
+    notify_timeout: float = 15
+    notify_telegram_timeout: float = 120
+    notify_workers: int = 4
+    log_level: str = 'INFO'
+    log_dir: str = os.path.join(PROJECT_ROOT, 'logs')
+    log_format: str = 'text'
+    log_rotation: str = 'size'
+    log_max_bytes: int = 5 * 1024 * 1024
+    log_backup_count: int = 7
+    control_api_host: str = '127.0.0.1'
+    control_api_port: int = 8765
+    control_api_token: Optional[str] = None
 
     class Config:
         env_file = '.env'
@@ -121,7 +260,9 @@ class AppSettings(BaseSettings):
 
 # ── Message templates ────────────────────────────────────────────────────────
 # Edit these strings to customise how Telegram notifications look.
-# Templates use Python str.format() — unknown variable names are left as-is.
+# Templates use Python str.format() syntax and are compiled once at startup;
+# unknown variable names are reported in the log and left as-is. Values are
+# HTML-escaped automatically, so only the template text may contain tags.
 # Supports standard Telegram HTML tags: <b>, <i>, <code>, <u>, <s>, <blockquote>.
 #
 # GAME_ROW_TEMPLATE — rendered once per game per account.
@@ -141,6 +282,10 @@ GAME_ROW_TEMPLATE = (
     "{game}: {player_name} <code>{uid}</code>\n"
     "[Day {day}]: {reward_name} × {reward_count} — {status}"
 )
+GAME_ROW_VARIABLES = (
+    'game', 'player_name', 'uid', 'ar', 'level', 'region', 'day',
+    'reward_name', 'reward_count', 'status', 'status_icon',
+)
 
 # ACCOUNT_HEADER_TEMPLATE — first line(s) of each account's blockquote.
 # Telegram shows the first ~3 lines when the quote is collapsed, so put
@@ -153,6 +298,7 @@ GAME_ROW_TEMPLATE = (
 #   {date}          — today's date  DD.MM.YYYY
 #
 ACCOUNT_HEADER_TEMPLATE = "Account {account_id}: {success_count}/{total_count} succeeded"
+ACCOUNT_HEADER_VARIABLES = ('account_id', 'success_count', 'total_count', 'status_icons', 'date')
 
 # ─────────────────────────────────────────────────────────────────────────────
 
@@ -269,6 +415,7 @@ def load_accounts() -> List[AccountConfig]:
                     cookies=cookie,
                     telegram_chat_id=chat_id,
                     enabled_games=enabled_games,
+                    legacy=True,
                 ))
             except Exception as e:
                 logger.warning(f"Error parsing account from OS_COOKIE_{game_name}: {e}")
@@ -302,6 +449,16 @@ def load_accounts() -> List[AccountConfig]:
     return accounts
 
 
+def parse_cookie_string(cookies: str) -> Dict[str, str]:
+    """Split a "name=value; name2=value2" cookie string into a dict."""
+    fields: Dict[str, str] = {}
+    for part in cookies.split(';'):
+        name, sep, value = part.strip().partition('=')
+        if sep and name:
+            fields[name] = value.strip()
+    return fields
+
+
 def get_telegram_config() -> TelegramConfig:
     """Get Telegram configuration."""
     settings = get_app_settings()
@@ -0,0 +1,261 @@
+"""
+Local HTTP control API for on-demand check-ins and run status (--serve).
+
+Endpoints (JSON unless noted):
+  POST /checkin       {"accounts": [...], "games": [...], "notify": false}
+                      enqueue a check-in for a subset; an omitted list means
+                      all accounts / games, an empty one matches nothing.
+                      Pairs already queued or running are skipped (listed
+                      in "skipped"); 409 if that leaves nothing to run
+  GET  /jobs/<id>     state and results of an enqueued check-in
+  GET  /status        pairs in progress, queued jobs and last results
+  GET  /results       last SignResult per account / game
+  GET  /metrics       run counters in Prometheus text format
+
+Meant for local tooling only: it binds to 127.0.0.1 by default and accepts
+an optional bearer token.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from .deadline import Deadline
+from .scheduler import WorkItem, plan_work
+from .sign import SignResult
+
+logger = logging.getLogger(__name__)
+
+MAX_JOBS_KEPT = 100
+
+
+def _string_list(body: Dict[str, Any], name: str) -> Optional[List[str]]:
+    """body[name] as a list of strings, None when absent; ValueError for anything else."""
+    value = body.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"'{name}' must be a list of strings")
+    return value
+
+
+class PairsBusyError(Exception):
+    """Every requested pair is already queued or running."""
+
+    def __init__(self, busy: List[Dict[str, Any]]):
+        super().__init__('every matching account / game pair is already queued or running')
+        self.busy = busy
+
+
+@dataclass
+class Job:
+    """One on-demand check-in request."""
+    id: str
+    items: List[WorkItem]
+    notify: bool = False
+    state: str = 'queued'  # queued | running | done | failed
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    results: List[SignResult] = field(default_factory=list)
+    skipped: List[Dict[str, Any]] = field(default_factory=list)  # pairs left to the job already running them
+    deadline: Optional[Deadline] = None  # each job is its own run with its own deadline
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'state': self.state,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'deadline_remaining_s': round(self.deadline.remaining(), 1) if self.state == 'running' else None,
+            'pairs': [{'account_id': i.account.account_id, 'game': i.game_name} for i in self.items],
+            'results': [
+                {'account_id': i.account.account_id, **asdict(r)} for i, r in zip(self.items, self.results)
+            ],
+            'skipped': self.skipped,
+        }
+
+
+class ControlServer:
+    """HTTP server exposing a CheckInManager to local tooling."""
+
+    def __init__(self, manager, host: str = '127.0.0.1', port: int = 8765, token: Optional[str] = None):
+        self.manager = manager
+        self.token = token
+        self.jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        # (account_id, game) -> id of the queued / running job that owns the pair
+        self._active: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        if host not in ('127.0.0.1', 'localhost', '::1'):
+            logger.warning(f"Control API bound to {host} — it is meant for local use only")
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def serve_forever(self):
+        logger.info(f"Control API listening on {self.address}")
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def shutdown(self):
+        self.httpd.shutdown()
+
+    # ── Jobs ──────────────────────────────────────────────────────────────────
+
+    def enqueue(self, account_ids: Optional[List[str]], games: Optional[List[str]], notify: bool = False) -> Job:
+        """
+        Create a job for the matching account / game pairs and start it on the
+        worker pool. Pairs another job (or a run) already has are skipped, so
+        each pair is still checked in once; PairsBusyError if none are left.
+        """
+        accounts = [a for a in self.manager.accounts if account_ids is None or a.account_id in account_ids]
+        matching = [i for i in plan_work(accounts) if games is None or i.game_name in games]
+        if not matching:
+            raise ValueError('no configured account / game pairs match the request')
+
+        job_id = uuid.uuid4().hex[:12]
+        running = self.manager.snapshot()['in_progress']
+        items, skipped = [], []
+        with self._lock:
+            for item in matching:
+                pair = (item.account.account_id, item.game_name)
+                if pair in self._active or pair in running:
+                    skipped.append({'account_id': pair[0], 'game': pair[1], 'job': self._active.get(pair)})
+                else:
+                    items.append(item)
+            if not items:
+                raise PairsBusyError(skipped)
+            for item in items:
+                self._active[(item.account.account_id, item.game_name)] = job_id
+            job = Job(id=job_id, items=items, notify=notify, skipped=skipped)
+            self.jobs[job.id] = job
+            while len(self.jobs) > MAX_JOBS_KEPT:
+                self.jobs.popitem(last=False)
+        threading.Thread(target=self._run_job, args=(job,), name=f'job-{job.id}', daemon=True).start()
+        return job
+
+    def _run_job(self, job: Job):
+        job.deadline = self.manager.make_deadline()
+        job.state = 'running'
+        try:
+            job.results = [r for _, r in self.manager.run_on_demand(job.items, job.notify, job.deadline)]
+            job.state = 'done'
+        except Exception as e:
+            logger.error(f"Control API job {job.id} failed: {e}")
+            job.state = 'failed'
+            job.error = str(e)
+        finally:
+            with self._lock:
+                for item in job.items:
+                    self._active.pop((item.account.account_id, item.game_name), None)
+        job.finished_at = time.time()
+
+    # ── Views ─────────────────────────────────────────────────────────────────
+
+    def status(self) -> Dict[str, Any]:
+        snapshot = self.manager.snapshot()
+        in_progress = [{'account_id': a, 'game': g, 'started_at': t} for (a, g), t in snapshot['in_progress'].items()]
+        with self._lock:
+            jobs = {state: sum(1 for j in self.jobs.values() if j.state == state) for state in ('queued', 'running')}
+        return {
+            'accounts': len(self.manager.accounts),
+            'in_progress': in_progress,
+            'jobs': jobs,
+            'results': self._format_results(snapshot['last_results']),
+        }
+
+    @staticmethod
+    def _format_results(last_results) -> List[Dict[str, Any]]:
+        return [{'account_id': a, **asdict(r)} for (a, _), r in last_results.items()]
+
+    def results(self) -> List[Dict[str, Any]]:
+        return self._format_results(self.manager.snapshot()['last_results'])
+
+    def metrics(self) -> str:
+        snapshot = self.manager.snapshot()
+        in_progress = len(snapshot['in_progress'])
+        lines = []
+        for name, value in snapshot['counters'].items():
+            metric = f'hoyosignin_{name}'
+            lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+        lines += ['# TYPE hoyosignin_pairs_in_progress gauge', f'hoyosignin_pairs_in_progress {in_progress}']
+        return '\n'.join(lines) + '\n'
+
+    # ── HTTP plumbing ─────────────────────────────────────────────────────────
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logger.debug(f"Control API: {fmt % args}")
+
+            def _send(self, status: HTTPStatus, body: Any, content_type: str = 'application/json'):
+                payload = body if isinstance(body, str) else json.dumps(body, ensure_ascii=False)
+                data = payload.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _authorized(self) -> bool:
+                if server.token and self.headers.get('Authorization') != f'Bearer {server.token}':
+                    self._send(HTTPStatus.UNAUTHORIZED, {'error': 'unauthorized'})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._authorized():
+                    return
+                if self.path == '/status':
+                    self._send(HTTPStatus.OK, server.status())
+                elif self.path == '/results':
+                    self._send(HTTPStatus.OK, server.results())
+                elif self.path == '/metrics':
+                    self._send(HTTPStatus.OK, server.metrics(), 'text/plain; version=0.0.4')
+                elif self.path.startswith('/jobs/'):
+                    job = server.jobs.get(self.path[len('/jobs/'):])
+                    if job is None:
+                        self._send(HTTPStatus.NOT_FOUND, {'error': 'unknown job'})
+                    else:
+                        self._send(HTTPStatus.OK, job.as_dict())
+                else:
+                    self._send(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+
+            def do_POST(self):
+                if not self._authorized():
+                    return
+                if self.path != '/checkin':
+                    self._send(HTTPStatus.NOT_FOUND, {'error': 'not found'})
+                    return
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                    if not isinstance(body, dict):
+                        raise ValueError('request body must be a JSON object')
+                    notify = body.get('notify', False)
+                    if not isinstance(notify, bool):
+                        raise ValueError("'notify' must be true or false")
+                    job = server.enqueue(_string_list(body, 'accounts'), _string_list(body, 'games'), notify)
+                except ValueError as e:
+                    self._send(HTTPStatus.BAD_REQUEST, {'error': str(e)})
+                    return
+                except PairsBusyError as e:
+                    self._send(HTTPStatus.CONFLICT, {'error': str(e), 'skipped': e.busy})
+                    return
+                self._send(HTTPStatus.ACCEPTED, {'job': job.id, 'url': f'/jobs/{job.id}', 'skipped': job.skipped})
+
+        return Handler
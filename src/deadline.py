@@ -0,0 +1,57 @@
+"""
+Run-level deadline so a run never spills past the daily HoYoLAB reset.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+# Daily rewards reset at 00:00 UTC+8 (16:00 UTC)
+RESET_TZ = timezone(timedelta(hours=8))
+
+
+class DeadlineExceeded(Exception):
+    """Raised when there is not enough run time left to start or finish a request."""
+
+
+def next_reset(now: Optional[datetime] = None) -> datetime:
+    """Return the next daily reset (midnight UTC+8) after now."""
+    now = (now or datetime.now(timezone.utc)).astimezone(RESET_TZ)
+    return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+class Deadline:
+    """A point in time (monotonic clock) by which the run must be finished."""
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Time budget from now.
+        """
+        self.budget = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def before_reset(cls, margin: float = 30, now: Optional[datetime] = None) -> 'Deadline':
+        """
+        Deadline margin seconds before the next reset. If the run already started
+        inside the margin, the reset itself is used instead.
+        """
+        now = now or datetime.now(timezone.utc)
+        until_reset = (next_reset(now) - now).total_seconds()
+        return cls(until_reset - margin if until_reset > margin else until_reset)
+
+    def remaining(self) -> float:
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, default: float) -> float:
+        """Per-request timeout: default, shortened to the remaining budget."""
+        return min(default, self.remaining())
+
+    def check(self, needed: float = 0):
+        """Raise DeadlineExceeded unless more than needed seconds remain."""
+        if self.remaining() <= needed:
+            raise DeadlineExceeded('run deadline reached')
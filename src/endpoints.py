@@ -0,0 +1,179 @@
+"""
+Latency-based selection between equivalent game API hosts.
+
+A game config may list mirrors for an API origin (``GameConfig.mirrors``).
+Every origin of such a group is probed now and then, real requests keep
+feeding their latency and errors back, and requests are routed to the
+fastest healthy origin. The choice is kept in a JSON file between runs.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from .config import GameConfig
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest sample in the moving latency / error averages
+SMOOTHING = 0.3
+# Origins failing more often than this are not routed to
+MAX_ERROR_RATE = 0.5
+# Keep the current origin unless another one is this much faster (avoids flapping)
+SWITCH_MARGIN = 1.2
+
+
+def origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def collect_endpoint_groups(game_configs: Dict[str, GameConfig]) -> Dict[str, List[str]]:
+    """Primary origin -> [primary, *mirrors] for every origin the given games list mirrors for."""
+    groups: Dict[str, List[str]] = {}
+    for config in game_configs.values():
+        for primary, mirrors in config.mirrors.items():
+            group = groups.setdefault(primary, [primary])
+            group.extend(m for m in mirrors if m not in group)
+    return groups
+
+
+class EndpointSelector:
+    """Routes requests for mirrored origins to the fastest healthy candidate."""
+
+    def __init__(self, groups: Dict[str, List[str]], state_file: str, probe_interval: float = 21600):
+        """
+        Args:
+            groups: Primary origin -> candidate origins (primary first).
+            state_file: JSON file keeping probe results and choices between runs.
+            probe_interval: Seconds after which a group's probe results are stale.
+        """
+        self.groups = groups
+        self.state_file = state_file
+        self.probe_interval = probe_interval
+        self._member_of = {origin: primary for primary, group in groups.items() for origin in group}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> 'EndpointSelector':
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f).get('groups', {})
+        except FileNotFoundError:
+            saved = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable endpoint state {self.state_file}: {e}')
+            saved = {}
+        for primary, group in self.groups.items():
+            entry = saved.get(primary, {})
+            hosts = {o: s for o, s in entry.get('hosts', {}).items() if o in group}
+            chosen = entry.get('chosen') if entry.get('chosen') in group else primary
+            self._state[primary] = {'chosen': chosen, 'probed_at': entry.get('probed_at', 0), 'hosts': hosts}
+        return self
+
+    def save(self):
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.state_file) or '.'
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'groups': self._state}, f, ensure_ascii=False, indent=2)
+                os.replace(tmp, self.state_file)
+            except OSError as e:
+                logger.warning(f'Could not save endpoint state: {e}')
+
+    # ── Routing ───────────────────────────────────────────────────────────────
+
+    def chosen(self, primary: str) -> str:
+        entry = self._state.get(primary)
+        return entry['chosen'] if entry else primary
+
+    def route(self, url: str) -> str:
+        """url with its origin replaced by the chosen origin of its group."""
+        origin = origin_of(url)
+        primary = self._member_of.get(origin)
+        if primary is None:
+            return url
+        target = self.chosen(primary)
+        return url if target == origin else target + url[len(origin):]
+
+    def record(self, url: str, latency: Optional[float], choose: bool = True):
+        """
+        Feed back one request to url: its latency in seconds, or None if the host
+        failed. Re-chooses the group's origin unless choose is False.
+        """
+        origin = origin_of(url)
+        primary = self._member_of.get(origin)
+        if primary is None:
+            return
+        with self._lock:
+            entry = self._state.setdefault(primary, {'chosen': primary, 'probed_at': 0, 'hosts': {}})
+            stats = entry['hosts'].setdefault(origin, {'latency': None, 'error_rate': 0.0})
+            stats['error_rate'] = (1 - SMOOTHING) * stats['error_rate'] + SMOOTHING * (0.0 if latency is not None else 1.0)
+            if latency is not None:
+                previous = stats['latency']
+                stats['latency'] = latency if previous is None else (1 - SMOOTHING) * previous + SMOOTHING * latency
+            if choose:
+                self._choose(primary, entry)
+
+    def _choose(self, primary: str, entry: Dict[str, Any]):
+        hosts = entry['hosts']
+        healthy = {
+            o: s['latency'] for o, s in hosts.items()
+            if s['latency'] is not None and s['error_rate'] < MAX_ERROR_RATE
+        }
+        current = entry['chosen']
+        if not healthy:
+            best = primary  # nothing known to work — use the configured host
+        else:
+            best = min(healthy, key=healthy.get)
+            if current in healthy and healthy[current] <= healthy[best] * SWITCH_MARGIN:
+                best = current
+        if best != current:
+            reason = 'slower' if current in healthy else 'failing' if current in hosts else 'not probed yet'
+            logger.info(f"Routing {primary} requests to {best} ({current} is {reason})")
+            entry['chosen'] = best
+
+    # ── Probing ───────────────────────────────────────────────────────────────
+
+    def stale_groups(self) -> List[str]:
+        now = time.time()
+        return [p for p in self.groups if now - self._state.get(p, {}).get('probed_at', 0) >= self.probe_interval]
+
+    def probe(self, transport, timeout: float = 5) -> int:
+        """
+        Time a HEAD request to every origin of each stale group in parallel and
+        re-choose. Any answer below 500 counts as healthy. Returns the number
+        of origins probed.
+        """
+        primaries = self.stale_groups()
+        origins = [o for p in primaries for o in self.groups[p]]
+        if not origins:
+            return 0
+
+        def probe_origin(origin: str):
+            started = time.monotonic()
+            try:
+                response = transport.head(origin, timeout)
+                ok = response.status_code < 500
+            except Exception as e:
+                logger.debug(f'Probe of {origin} failed: {e}')
+                ok = False
+            self.record(origin, time.monotonic() - started if ok else None, choose=False)
+
+        with ThreadPoolExecutor(max_workers=len(origins), thread_name_prefix='probe') as pool:
+            list(pool.map(probe_origin, origins))
+        now = time.time()
+        with self._lock:
+            for primary in primaries:
+                entry = self._state.setdefault(primary, {'chosen': primary, 'probed_at': 0, 'hosts': {}})
+                entry['probed_at'] = now
+                self._choose(primary, entry)
+        for primary in primaries:
+            logger.info(f"Endpoint for {primary}: {self.chosen(primary)}")
+        return len(origins)
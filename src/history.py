@@ -0,0 +1,100 @@
+"""
+Persistent per-pair run history used to order work across runs.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from .deadline import RESET_TZ
+from .sign import SignResult
+
+logger = logging.getLogger(__name__)
+
+# Assumed duration of a pair without history: four requests plus the pre-sign delay
+DEFAULT_PAIR_DURATION = 5.0
+
+
+def reset_day(now: Optional[datetime] = None) -> str:
+    """The current HoYoLAB check-in day (date in UTC+8) as YYYY-MM-DD."""
+    return (now or datetime.now(timezone.utc)).astimezone(RESET_TZ).strftime('%Y-%m-%d')
+
+
+class RunHistory:
+    """
+    Recent outcomes and durations per (account, game) pair, stored as JSON.
+
+    Only the last max_samples runs are kept per pair.
+    """
+
+    def __init__(self, path: str, max_samples: int = 10):
+        self.path = path
+        self.max_samples = max_samples
+        self._pairs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(account_id: str, game: str) -> str:
+        return f'{account_id}|{game}'
+
+    def load(self) -> 'RunHistory':
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._pairs = json.load(f).get('pairs', {})
+        except FileNotFoundError:
+            self._pairs = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f'Ignoring unreadable run history {self.path}: {e}')
+            self._pairs = {}
+        return self
+
+    def save(self):
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path) or '.'
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'pairs': self._pairs}, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except OSError as e:
+                logger.warning(f'Could not save run history: {e}')
+
+    def record(self, account_id: str, game: str, result: SignResult, duration: float):
+        """Add one pair outcome."""
+        with self._lock:
+            entry = self._pairs.setdefault(self._key(account_id, game), {'durations': [], 'failures': []})
+            entry['durations'] = (entry['durations'] + [round(duration, 3)])[-self.max_samples:]
+            entry['failures'] = (entry['failures'] + [0 if result.success else 1])[-self.max_samples:]
+            if result.success:
+                entry['signed_day'] = reset_day()
+                entry['result'] = asdict(result)
+
+    def _samples(self, account_id: str, game: str, field: str) -> List[float]:
+        return self._pairs.get(self._key(account_id, game), {}).get(field, [])
+
+    def signed_today(self, account_id: str, game: str) -> bool:
+        entry = self._pairs.get(self._key(account_id, game), {})
+        return entry.get('signed_day') == reset_day()
+
+    def last_result(self, account_id: str, game: str) -> Optional[SignResult]:
+        """The last successful SignResult for the pair, if any."""
+        data = self._pairs.get(self._key(account_id, game), {}).get('result')
+        return SignResult(**data) if data else None
+
+    def expected_duration(self, account_id: str, game: str) -> float:
+        samples = self._samples(account_id, game, 'durations')
+        return sum(samples) / len(samples) if samples else DEFAULT_PAIR_DURATION
+
+    def failure_rate(self, account_id: str, game: str) -> float:
+        samples = self._samples(account_id, game, 'failures')
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def game_failure_rate(self, game: str) -> float:
+        """Failure rate of a game's API hosts across all accounts."""
+        suffix = f'|{game}'
+        samples = [f for key, entry in self._pairs.items() if key.endswith(suffix) for f in entry.get('failures', [])]
+        return sum(samples) / len(samples) if samples else 0.0
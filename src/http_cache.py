@@ -0,0 +1,181 @@
+"""
+On-disk HTTP response cache with conditional revalidation.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Optional, Dict, Any
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_cache_control(value: str) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition('=')
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+def _parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpCache:
+    """
+    Bounded on-disk cache for GET responses.
+
+    Entries are keyed by method, URL and a hash of the request's Cookie header,
+    so authenticated responses are never served to a different cookie. The
+    cookie itself is never written to disk. When the store grows beyond
+    max_entries the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 256, default_ttl: int = 0):
+        """
+        Args:
+            directory: Directory for cache entries; created on first write.
+            max_entries: Maximum number of stored responses.
+            default_ttl: Freshness in seconds for responses that carry validators
+                         but no Cache-Control/Expires. 0 means always revalidate.
+        """
+        self.directory = Path(directory)
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+
+    # ── Keys & storage ────────────────────────────────────────────────────────
+
+    @staticmethod
+    def make_key(method: str, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        cookie = (headers or {}).get('Cookie', '')
+        scope = hashlib.sha256(cookie.encode('utf-8')).hexdigest() if cookie else 'public'
+        return hashlib.sha256(f'{method.upper()} {url} {scope}'.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}.json'
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for key, or None. Marks the entry as recently used."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                os.utime(path)
+                return entry
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f'Discarding unreadable cache entry {path.name}: {e}')
+                path.unlink(missing_ok=True)
+                return None
+
+    def _write(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f)
+                os.replace(tmp, self._path(key))
+                self._evict()
+            except OSError as e:
+                logger.warning(f'Could not write HTTP cache entry: {e}')
+
+    def _evict(self):
+        entries = sorted(self.directory.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for path in entries[:max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+    # ── HTTP semantics ────────────────────────────────────────────────────────
+
+    def _expires_at(self, headers: CaseInsensitiveDict, now: float) -> Optional[float]:
+        """Return the freshness deadline, or None if the response must not be stored."""
+        directives = _parse_cache_control(headers.get('Cache-Control', ''))
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return now
+        max_age = directives.get('max-age')
+        if max_age is not None and max_age.isdigit():
+            return now + int(max_age)
+        expires = _parse_http_date(headers.get('Expires'))
+        if expires is not None:
+            return expires
+        if 'ETag' in headers or 'Last-Modified' in headers:
+            return now + self.default_ttl
+        return None
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any]) -> bool:
+        return entry.get('expires_at', 0) > time.time()
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Validator headers for revalidating a stale entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, key: str, response: requests.Response):
+        """Store a 200 response if its headers allow caching."""
+        if response.status_code != 200:
+            return
+        now = time.time()
+        expires_at = self._expires_at(response.headers, now)
+        if expires_at is None:
+            return
+        self._write(key, {
+            'url': str(response.url),
+            'status_code': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() != 'set-cookie'},
+            'encoding': response.encoding,
+            'content': base64.b64encode(response.content).decode('ascii'),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'expires_at': expires_at,
+        })
+
+    def refresh(self, key: str, entry: Dict[str, Any], not_modified: requests.Response):
+        """Update an entry's freshness after a 304 Not Modified."""
+        merged = CaseInsensitiveDict(entry['headers'])
+        merged.update(not_modified.headers)
+        expires_at = self._expires_at(merged, time.time())
+        if expires_at is None:
+            return
+        entry['expires_at'] = expires_at
+        entry['etag'] = merged.get('ETag') or entry.get('etag')
+        entry['last_modified'] = merged.get('Last-Modified') or entry.get('last_modified')
+        self._write(key, entry)
+
+    @staticmethod
+    def to_response(entry: Dict[str, Any]) -> requests.Response:
+        """Rebuild a requests.Response from a stored entry."""
+        response = requests.Response()
+        response.status_code = entry['status_code']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.encoding = entry.get('encoding')
+        response.url = entry['url']
+        response._content = base64.b64decode(entry['content'])
+        return response
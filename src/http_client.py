@@ -3,23 +3,98 @@ HTTP client for working with API.
 """
 import json
 import logging
-from typing import Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable
 import requests
+from .deadline import Deadline
+from .endpoints import EndpointSelector
+from .http_cache import HttpCache
+from .transports import Transport, create_transport
 
 logger = logging.getLogger(__name__)
 
+# Don't start an attempt with less time than this left before the run deadline
+MIN_ATTEMPT_TIME = 1.0
+
 
 class HttpClient:
-    """HTTP client with optional proxy support and retry logic."""
+    """HTTP client with optional proxy support, retry logic and a pluggable pooled transport."""
 
-    def __init__(self, proxy: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        proxy: Optional[Dict[str, str]] = None,
+        cache: Optional[HttpCache] = None,
+        pool_size: int = 10,
+        deadline: Optional[Deadline] = None,
+        timeout: float = 30,
+        transport: str = 'requests',
+        http2: bool = True,
+        endpoints: Optional[EndpointSelector] = None,
+    ):
         """
         Args:
             proxy: requests-compatible proxy dict, e.g.
                    {'http': 'socks5://host:port', 'https': 'socks5://host:port'}
                    Pass None to make direct connections.
+            cache: Response cache used by requests made with cache=True.
+                   Pass None to disable caching.
+            pool_size: Keep-alive connections kept per host.
+            deadline: Default run deadline (see request()). Attempts are not started once
+                      it is (nearly) reached and per-attempt timeouts never extend past it.
+            timeout: Per-attempt timeout in seconds.
+            transport: 'requests' (HTTP/1.1) or 'httpx' (HTTP/2, optional dependency).
+            http2: Negotiate HTTP/2 when using the httpx transport.
+            endpoints: Routes requests for mirrored API hosts to the fastest healthy
+                       one and receives each request's latency / failure.
         """
         self.proxy = proxy
+        self.cache = cache
+        self.pool_size = pool_size
+        self.deadline = deadline
+        self.timeout = timeout
+        self.transport_name = transport
+        self.http2 = http2
+        self.endpoints = endpoints
+        self._transport: Optional[Transport] = None
+        self._transport_lock = threading.Lock()
+
+    @property
+    def transport(self) -> Transport:
+        """Shared transport, so connections (and TLS/SOCKS handshakes) are reused across requests."""
+        if self._transport is None:
+            with self._transport_lock:
+                if self._transport is None:
+                    self._transport = create_transport(self.transport_name, self.proxy, self.pool_size, self.http2)
+        return self._transport
+
+    def close(self):
+        """Close pooled connections."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    def warm_up(self, origins: Iterable[str], timeout: float = 10) -> int:
+        """
+        Open a pooled keep-alive connection to each origin (scheme://host).
+
+        Sends a HEAD request per origin in parallel; the response itself is
+        ignored. Returns the number of origins that answered.
+        """
+        def open_connection(origin: str) -> bool:
+            try:
+                self.transport.head(origin, timeout)
+                return True
+            except Exception as e:
+                logger.debug(f'Warm-up of {origin} failed: {e}')
+                return False
+
+        origins = list(origins)
+        if not origins:
+            return 0
+        with ThreadPoolExecutor(max_workers=len(origins), thread_name_prefix='warmup') as pool:
+            return sum(pool.map(open_connection, origins))
 
     @staticmethod
     def to_python(json_str: str) -> Any:
@@ -44,6 +119,8 @@ class HttpClient:
         data: Optional[Any] = None,
         json: Optional[Dict] = None,
         headers: Optional[Dict[str, str]] = None,
+        cache: bool = False,
+        deadline: Optional[Deadline] = None,
         **kwargs
     ) -> requests.Response:
         """
@@ -57,33 +134,64 @@ class HttpClient:
             data: Raw request body
             json: JSON body (sets Content-Type automatically)
             headers: HTTP headers
-            **kwargs: Additional arguments forwarded to requests
+            cache: Serve GET responses from the HTTP cache, revalidating stale
+                   entries with If-None-Match / If-Modified-Since
+            deadline: Deadline of the run this request belongs to; defaults to
+                      the client's deadline
+            **kwargs: Additional arguments forwarded to the transport
 
         Returns:
-            Response object
+            Response object (requests.Response, or httpx.Response with the httpx transport)
 
         Raises:
+            DeadlineExceeded: When the run deadline leaves no time for another attempt
             Exception: When all attempts fail
         """
+        cache_key = None
+        entry = None
+        if cache and self.cache is not None and method.upper() == 'GET':
+            cache_key = self.cache.make_key(method, requests.Request('GET', url, params=params).prepare().url, headers)
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                if self.cache.is_fresh(entry):
+                    logger.debug(f'HTTP cache hit: {url}')
+                    return self.cache.to_response(entry)
+                headers = {**(headers or {}), **self.cache.conditional_headers(entry)}
+
+        deadline = deadline or self.deadline
         for attempt in range(max_retry + 1):
+            timeout = self.timeout
+            if deadline is not None:
+                deadline.check(MIN_ATTEMPT_TIME)
+                timeout = deadline.timeout(timeout)
+            # Re-routed on every attempt, so a retry after a failure can go to another mirror
+            target = self.endpoints.route(url) if self.endpoints is not None else url
+            started = time.monotonic()
             try:
-                with requests.Session() as session:
-                    if self.proxy:
-                        session.proxies = self.proxy
-                    response = session.request(
-                        method=method,
-                        url=url,
-                        params=params,
-                        data=data,
-                        json=json,
-                        headers=headers,
-                        timeout=30,
-                        **kwargs
-                    )
-                    response.raise_for_status()
-                    return response
+                response = self.transport.request(
+                    method,
+                    target,
+                    timeout,
+                    params=params,
+                    data=data,
+                    json=json,
+                    headers=headers,
+                    **kwargs
+                )
+                if self.endpoints is not None:
+                    self.endpoints.record(target, None if response.status_code >= 500 else time.monotonic() - started)
+                self.transport.raise_for_status(response)
+                if cache_key is not None:
+                    if response.status_code == 304 and entry is not None:
+                        logger.debug(f'HTTP cache revalidated: {url}')
+                        self.cache.refresh(cache_key, entry, response)
+                        return self.cache.to_response(entry)
+                    self.cache.store(cache_key, response)
+                return response
 
             except Exception as e:
+                if self.endpoints is not None and getattr(e, 'response', None) is None:
+                    self.endpoints.record(target, None)  # no answer at all: connection / timeout
                 logger.error(f'Request error (attempt {attempt + 1}/{max_retry + 1}): {e}')
                 if attempt < max_retry:
                     continue
@@ -0,0 +1,222 @@
+"""
+Non-blocking logging: records go through a queue to a background writer thread.
+
+Handlers (console, rotating run log, rotating error log) live on the
+QueueListener thread, so file I/O never happens on a request thread.
+"""
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+# Account / game the current thread is working on; copied into every record
+_log_context: contextvars.ContextVar = contextvars.ContextVar('log_context', default={})
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+TEXT_FORMAT = '%(asctime)s [%(levelname)s] %(name)s%(context)s: %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields (e.g. account=..., game=...) to every record logged inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the current log context onto the record (runs in the emitting thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        record.account = context.get('account')
+        record.game = context.get('game')
+        fields = '/'.join(filter(None, (record.account, record.game)))
+        record.context = f' [{fields}]' if fields else ''
+        return True
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener's handlers.
+
+    The stock prepare() formats the whole record (traceback included) into
+    msg and drops exc_info, so file formatters never see the exception. Here
+    only the message is resolved, and the traceback is rendered into exc_text,
+    which TextFormatter appends and JsonFormatter puts in its own field (and
+    which, unlike a traceback object, can cross a process queue).
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class TextFormatter(logging.Formatter):
+    """The usual text format, with " [account/game]" after the logger name when known."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, 'context'):
+            record.context = ''
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including account / game context fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'account': getattr(record, 'account', None),
+            'game': getattr(record, 'game', None),
+            'thread': record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _file_handler(path: str, rotation: str, max_bytes: int, backup_count: int) -> logging.Handler:
+    if rotation == 'time':
+        return logging.handlers.TimedRotatingFileHandler(path, when='midnight', backupCount=backup_count, encoding='utf-8')
+    return logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+
+
+def setup_logging(
+    level: str = 'INFO',
+    log_dir: Optional[str] = None,
+    fmt: str = 'text',
+    rotation: str = 'size',
+    max_bytes: int = 5 * 1024 * 1024,
+    backup_count: int = 7,
+):
+    """
+    Route all logging through a queue to a background writer.
+
+    Args:
+        level: Root log level name.
+        log_dir: Directory for hoyosignin.log and errors.log; None logs to the console only.
+        fmt: 'text' or 'json' (files only — the console always uses text).
+        rotation: 'size' (max_bytes per file) or 'time' (daily at midnight).
+        max_bytes: Size limit for size-based rotation.
+        backup_count: Rotated files to keep.
+
+    Calling it again replaces the previous configuration.
+    """
+    global _listener
+    _stop_listener()
+
+    text_formatter = TextFormatter(TEXT_FORMAT, DATE_FORMAT)
+    file_formatter = JsonFormatter() if fmt == 'json' else text_formatter
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(text_formatter)
+    handlers = [console]
+
+    if log_dir:
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            run_log = _file_handler(os.path.join(log_dir, 'hoyosignin.log'), rotation, max_bytes, backup_count)
+            error_log = _file_handler(os.path.join(log_dir, 'errors.log'), rotation, max_bytes, backup_count)
+            error_log.setLevel(logging.ERROR)
+            for handler in (run_log, error_log):
+                handler.setFormatter(file_formatter)
+                handlers.append(handler)
+        except OSError as e:
+            print(f'Could not open log directory {log_dir}: {e}', file=sys.stderr)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = RecordQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+@atexit.register
+def _stop_listener():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@contextmanager
+def process_log_queue(context):
+    """
+    Yield a queue from the multiprocessing context whose records are written by
+    this process's handlers. Worker processes pass it to setup_worker_logging(),
+    so only this process ever opens (and rotates) the log files.
+    """
+    log_queue = context.Queue()
+    if _listener is not None:
+        handlers = _listener.handlers
+    else:
+        handlers = (logging.StreamHandler(sys.stderr),)
+        handlers[0].setFormatter(TextFormatter(TEXT_FORMAT, DATE_FORMAT))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    try:
+        yield log_queue
+    finally:
+        listener.stop()
+        log_queue.close()
+
+
+def setup_worker_logging(log_queue, level: str = 'INFO'):
+    """
+    Send this (worker) process's records to the queue from process_log_queue()
+    instead of writing them here. Replaces any previous configuration.
+    """
+    _stop_listener()
+    queue_handler = RecordQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level.upper())
+
+
+def setup_logging_from_settings(settings):
+    """setup_logging() using the LOG_* values of an AppSettings instance."""
+    setup_logging(
+        level=settings.log_level,
+        log_dir=settings.log_dir or None,
+        fmt=settings.log_format,
+        rotation=settings.log_rotation,
+        max_bytes=settings.log_max_bytes,
+        backup_count=settings.log_backup_count,
+    )
@@ -1,11 +1,19 @@
 """
-Module for sending notifications via Telegram.
+Module for sending notifications via Telegram, webhooks and local files.
 """
+import html
+import json
 import logging
+import os
+import queue
+import re
+import threading
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from .http_client import HttpClient
-from .config import get_telegram_config, get_proxy_config, TelegramConfig
+from .config import get_app_settings, get_telegram_config, get_proxy_config, TelegramConfig
+from .deadline import Deadline
+from .profiling import profile_phase, run_profiled
 
 logger = logging.getLogger(__name__)
 
@@ -41,7 +49,8 @@ class TelegramNotifier:
         chat_id: str,
         text: str,
         parse_mode: str = 'HTML',
-        disable_web_page_preview: bool = True
+        disable_web_page_preview: bool = True,
+        deadline: Optional[Deadline] = None,
     ) -> bool:
         if not self.config.bot_token or not self.config.enable_notifications:
             return False
@@ -58,18 +67,16 @@ class TelegramNotifier:
         }
 
         try:
-            response = self.http_client.request('GET', url, params=params)
+            response = self.http_client.request('GET', url, params=params, deadline=deadline)
             result = response.json()
             if result.get('ok'):
                 logger.info(f"Notification sent to Telegram (chat_id: {chat_id})")
                 return True
             error_description = result.get('description', 'Unknown error')
             logger.error(f"Telegram API error: {error_description}")
-            self._log_error(f"Telegram API error: {error_description}")
             return False
         except Exception as e:
-            logger.error(f"Exception sending notification: {e}")
-            self._log_error(f"Exception sending Telegram notification: {e}")
+            logger.error(f"Exception sending Telegram notification: {e}")
             return False
 
     def send(
@@ -78,7 +85,8 @@ class TelegramNotifier:
         app: str = 'HoyoSignIn',
         status: str = '',
         msg: str = '',
-        use_html: bool = True
+        use_html: bool = True,
+        deadline: Optional[Deadline] = None,
     ) -> bool:
         """
         Send a notification.
@@ -89,6 +97,7 @@ class TelegramNotifier:
             status: Short status line.
             msg: Detailed message body.
             use_html: Whether to use HTML formatting.
+            deadline: Give up (instead of starting another attempt) once it is reached.
 
         Returns:
             True if the message was delivered successfully.
@@ -112,22 +121,13 @@ class TelegramNotifier:
             target_chat_id,
             formatted,
             parse_mode='HTML' if use_html else None,
+            deadline=deadline,
         )
 
     def send_batch(self, notifications: List[Dict[str, Any]]) -> int:
         """Send multiple notifications. Returns the count of successful sends."""
         return sum(1 for n in notifications if self.send(**n))
 
-    @staticmethod
-    def _log_error(error_msg: str):
-        """Append error to error_log.txt."""
-        try:
-            with open("../error_log.txt", "a", encoding='utf-8') as f:
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                f.write(f"[{timestamp}] {error_msg}\n")
-        except Exception as e:
-            logger.error(f"Error writing to error_log.txt: {e}")
-
 
 # Backward-compatibility wrapper
 class Notify:
@@ -142,3 +142,202 @@ class Notify:
             logger.info(f'Check-in result: {status}\n\n{msg}')
         chat_id = self.default_chat_id or self.telegram.config.default_chat_id
         self.telegram.send(chat_id=chat_id, app=app, status=status, msg=msg)
+
+
+# ── Notification sinks ────────────────────────────────────────────────────────
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def html_to_text(text: str) -> str:
+    """Strip Telegram HTML tags and unescape entities for plain-text sinks."""
+    return html.unescape(_TAG_RE.sub('', text))
+
+
+class NotificationSink:
+    """A destination for run summaries. Subclasses implement send()."""
+
+    name = 'sink'
+
+    def __init__(self, timeout: float = 15):
+        """
+        Args:
+            timeout: Seconds the dispatcher waits for this sink before giving up on it.
+        """
+        self.timeout = timeout
+
+    def send(self, chat_id: Optional[str], app: str, status: str, msg: str,
+             deadline: Optional[Deadline] = None) -> bool:
+        """
+        Deliver one message (msg is Telegram HTML). Returns True on success.
+        Requests should not be attempted past deadline (the sink's timeout).
+        """
+        raise NotImplementedError
+
+
+class TelegramSink(NotificationSink):
+    """Sends each chat's message to its Telegram chat."""
+
+    name = 'telegram'
+
+    def __init__(self, notifier: TelegramNotifier, timeout: float = 15):
+        super().__init__(timeout)
+        self.notifier = notifier
+
+    def send(self, chat_id, app, status, msg, deadline=None):
+        if not chat_id:
+            return False  # accounts without a Telegram chat only go to the other sinks
+        with profile_phase('telegram'):
+            return self.notifier.send(chat_id=chat_id, app=app, status=status, msg=msg, deadline=deadline)
+
+
+class WebhookSink(NotificationSink):
+    """
+    POSTs messages to an HTTP webhook.
+
+    Formats:
+      discord — {"content": "..."}
+      slack   — {"text": "..."}
+      json    — {"app", "status", "chat_id", "message", "message_html"}
+    """
+
+    name = 'webhook'
+
+    def __init__(self, url: str, fmt: Optional[str] = None, proxy: Optional[Dict[str, str]] = None, timeout: float = 15):
+        super().__init__(timeout)
+        self.url = url
+        self.format = fmt or self.detect_format(url)
+        self.http_client = HttpClient(proxy=proxy, timeout=timeout)
+
+    @staticmethod
+    def detect_format(url: str) -> str:
+        if 'discord.com/api/webhooks' in url or 'discordapp.com/api/webhooks' in url:
+            return 'discord'
+        if 'hooks.slack.com' in url:
+            return 'slack'
+        return 'json'
+
+    def _payload(self, chat_id: Optional[str], app: str, status: str, msg: str) -> Dict[str, Any]:
+        text = f"{app}\n{status}\n\n{html_to_text(msg)}"
+        if self.format == 'discord':
+            return {'content': text[:2000]}  # Discord rejects longer messages
+        if self.format == 'slack':
+            return {'text': text}
+        return {'app': app, 'status': status, 'chat_id': chat_id, 'message': html_to_text(msg), 'message_html': msg}
+
+    def send(self, chat_id, app, status, msg, deadline=None):
+        try:
+            self.http_client.request(
+                'POST', self.url, max_retry=1, json=self._payload(chat_id, app, status, msg), deadline=deadline
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Webhook notification failed: {e}")
+            return False
+
+
+class FileSink(NotificationSink):
+    """Appends one JSON line per message to a local file."""
+
+    name = 'file'
+    _lock = threading.Lock()
+
+    def __init__(self, path: str, timeout: float = 15):
+        super().__init__(timeout)
+        self.path = path
+
+    def send(self, chat_id, app, status, msg, deadline=None):
+        record = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'app': app, 'status': status, 'chat_id': chat_id,
+            'message': html_to_text(msg),
+        }
+        try:
+            with self._lock:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            return True
+        except OSError as e:
+            logger.error(f"Could not write notification file {self.path}: {e}")
+            return False
+
+
+class NotificationDispatcher:
+    """
+    Delivers messages to every sink concurrently, each sink on its own daemon threads.
+
+    Every sink gets its own queue and up to max_workers threads, so a slow sink
+    never holds up another one. dispatch() waits at most each sink's timeout,
+    which is also passed to the sink as a deadline for its requests; a sink
+    still busy after that is abandoned and never delays process exit.
+    """
+
+    def __init__(self, sinks: List[NotificationSink], max_workers: int = 4):
+        self.sinks = sinks
+        self.max_workers = max_workers
+
+    def _start(self, sink: NotificationSink, messages: List[Dict[str, Any]], deadline: Deadline) -> List[Dict[str, Any]]:
+        """Queue messages for sink and start its workers; returns the task records."""
+        tasks = [{'message': message, 'done': threading.Event(), 'ok': False} for message in messages]
+        pending: queue.Queue = queue.Queue()
+        for task in tasks:
+            pending.put(task)
+
+        def worker():
+            while True:
+                try:
+                    task = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    task['ok'] = bool(sink.send(**task['message'], deadline=deadline))
+                except Exception as e:
+                    logger.error(f"{sink.name} notification failed: {e}")
+                finally:
+                    task['done'].set()
+
+        for i in range(min(self.max_workers, len(tasks))):
+            threading.Thread(target=run_profiled, args=(worker,), name=f'notify-{sink.name}-{i}', daemon=True).start()
+        return tasks
+
+    def dispatch(self, messages: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Send every message to every sink.
+
+        Args:
+            messages: dicts with chat_id, app, status and msg keys.
+
+        Returns:
+            Successful deliveries per sink name.
+        """
+        if not messages or not self.sinks:
+            return {}
+        started = [(sink, Deadline(sink.timeout)) for sink in self.sinks]
+        running = [(sink, deadline, self._start(sink, messages, deadline)) for sink, deadline in started]
+
+        delivered: Dict[str, int] = {sink.name: 0 for sink in self.sinks}
+        for sink, deadline, tasks in running:
+            unfinished = 0
+            for task in tasks:
+                if task['done'].wait(deadline.remaining()):
+                    delivered[sink.name] += task['ok']
+                else:
+                    unfinished += 1
+            if unfinished:
+                logger.warning(f"{sink.name}: {unfinished} notification(s) not finished after {sink.timeout:.0f}s"
+                               f" — not waiting for them")
+        return delivered
+
+
+def build_sinks(telegram: Optional[TelegramNotifier] = None) -> List[NotificationSink]:
+    """Create the sinks enabled in the settings (Telegram is always included)."""
+    settings = get_app_settings()
+    timeout = settings.notify_timeout
+    sinks: List[NotificationSink] = [TelegramSink(telegram or TelegramNotifier(), settings.notify_telegram_timeout)]
+    proxy = get_proxy_config().get_telegram_proxy()
+    for url in filter(None, (u.strip() for u in (settings.notify_webhook_urls or '').split(','))):
+        sinks.append(WebhookSink(url, settings.notify_webhook_format, proxy, timeout))
+    if settings.notify_file:
+        sinks.append(FileSink(settings.notify_file, timeout))
+    return sinks
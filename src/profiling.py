@@ -0,0 +1,215 @@
+"""
+Per-phase run profiling (the --profile run mode).
+
+Code marks its phases with ``profile_phase('info', game)``; when profiling is
+disabled that is a shared no-op context manager, so instrumented code costs
+nothing in normal runs. Tasks handed to worker threads go through
+``run_profiled`` so --cprofile sees them too.
+"""
+import cProfile
+import io
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Phases in report order
+PHASES = ('config', 'probe', 'warmup', 'roles', 'info', 'awards', 'sleep', 'sign', 'render', 'notify', 'telegram')
+
+_NULL_PHASE = nullcontext()
+
+
+class PhaseStats:
+    """Accumulated wall time, CPU time and allocations for one phase (optionally one game)."""
+
+    __slots__ = ('calls', 'wall', 'cpu', 'alloc')
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.alloc = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {'calls': self.calls, 'wall_s': round(self.wall, 6), 'cpu_s': round(self.cpu, 6), 'alloc_bytes': self.alloc}
+
+
+class RunProfiler:
+    """Collects per-phase and per-game timings for one run."""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stats: Dict[Tuple[str, Optional[str]], PhaseStats] = {}
+        self._lock = threading.Lock()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+        self.total_wall = 0.0
+        self.total_cpu = 0.0
+        self.peak_memory = 0
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def phase(self, name: str, game: Optional[str] = None):
+        # Allocations are process-wide, so phases running concurrently share the delta
+        alloc_before = tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        wall_before = time.perf_counter()
+        cpu_before = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_before
+            cpu = time.thread_time() - cpu_before
+            alloc = max(0, tracemalloc.get_traced_memory()[0] - alloc_before) if self.trace_memory else 0
+            with self._lock:
+                keys = [(name, None)] + ([(name, game)] if game else [])
+                for key in keys:
+                    stats = self.stats.setdefault(key, PhaseStats())
+                    stats.calls += 1
+                    stats.wall += wall
+                    stats.cpu += cpu
+                    stats.alloc += alloc
+
+    def finish(self):
+        """Stop the run clocks (and memory tracing)."""
+        self.total_wall = time.perf_counter() - self._started_wall
+        self.total_cpu = time.process_time() - self._started_cpu
+        if self.trace_memory and tracemalloc.is_tracing():
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def _ordered_keys(self) -> List[Tuple[str, Optional[str]]]:
+        rank = {name: i for i, name in enumerate(PHASES)}
+        return sorted(self.stats, key=lambda k: (rank.get(k[0], len(PHASES)), k[0], k[1] or ''))
+
+    def as_dict(self) -> Dict[str, Any]:
+        phases: Dict[str, Any] = {}
+        for name, game in self._ordered_keys():
+            entry = phases.setdefault(name, {'games': {}})
+            if game is None:
+                entry.update(self.stats[(name, None)].as_dict())
+            else:
+                entry['games'][game] = self.stats[(name, game)].as_dict()
+        return {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'total_wall_s': round(self.total_wall, 6),
+            'total_cpu_s': round(self.total_cpu, 6),
+            'peak_memory_bytes': self.peak_memory if self.trace_memory else None,
+            'phases': phases,
+        }
+
+    def format_report(self) -> str:
+        lines = [
+            f"HoyoSignIn profile — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Total wall {self.total_wall:.3f}s, CPU {self.total_cpu:.3f}s"
+            + (f", peak traced memory {self.peak_memory / 1024:.1f} KiB" if self.trace_memory else ''),
+            '',
+            f"{'phase':<12}{'game':<10}{'calls':>7}{'wall s':>11}{'cpu s':>11}{'alloc KiB':>12}",
+        ]
+        for name, game in self._ordered_keys():
+            s = self.stats[(name, game)]
+            alloc = f'{s.alloc / 1024:.1f}' if self.trace_memory else '-'
+            label = name if game is None else ''
+            lines.append(f"{label:<12}{game or '':<10}{s.calls:>7}{s.wall:>11.3f}{s.cpu:>11.3f}{alloc:>12}")
+        return '\n'.join(lines) + '\n'
+
+    def write_report(self, path: str):
+        """Write the report to path — JSON if it ends with .json, plain text otherwise."""
+        with open(path, 'w', encoding='utf-8') as f:
+            if path.endswith('.json'):
+                json.dump(self.as_dict(), f, indent=2, ensure_ascii=False)
+            else:
+                f.write(self.format_report())
+        logger.info(f"Profile report written to {path}")
+
+
+class ThreadCProfiler:
+    """
+    cProfile over the whole run, worker threads included.
+
+    From Python 3.12 one profiler sees every thread. Before that a profiler
+    only sees the thread that enabled it, so each task run through
+    run_profiled gets its own profiler and all of them are merged at the end.
+    """
+
+    def __init__(self):
+        self.main = cProfile.Profile()
+        self.per_task = sys.version_info < (3, 12)
+        self._task_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.main.enable()
+
+    def disable(self):
+        self.main.disable()
+
+    def run_task(self, fn, *args):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return fn(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._task_profiles.append(profile)
+
+    def stats(self, stream=None) -> pstats.Stats:
+        stats = pstats.Stats(self.main, stream=stream)
+        with self._lock:
+            for profile in self._task_profiles:
+                stats.add(profile)
+        return stats
+
+    def write(self, path: str, top: int = 25):
+        """Dump merged stats to path and log the top functions by cumulative time."""
+        output = io.StringIO()
+        stats = self.stats(output)
+        stats.dump_stats(path)
+        stats.sort_stats('cumulative').print_stats(top)
+        logger.info(f"cProfile data written to {path}\n{output.getvalue()}")
+
+
+_profiler: Optional[RunProfiler] = None
+_cprofiler: Optional[ThreadCProfiler] = None
+
+
+def enable(trace_memory: bool = False) -> RunProfiler:
+    """Start profiling the current run."""
+    global _profiler
+    _profiler = RunProfiler(trace_memory=trace_memory)
+    return _profiler
+
+
+def get_profiler() -> Optional[RunProfiler]:
+    return _profiler
+
+
+def enable_cprofile() -> ThreadCProfiler:
+    """Start cProfile for the current run (--cprofile)."""
+    global _cprofiler
+    _cprofiler = ThreadCProfiler()
+    _cprofiler.enable()
+    return _cprofiler
+
+
+def run_profiled(fn, *args):
+    """Run a worker-thread task, under its own cProfile profiler when one is needed."""
+    if _cprofiler is None or not _cprofiler.per_task:
+        return fn(*args)
+    return _cprofiler.run_task(fn, *args)
+
+
+def profile_phase(name: str, game: Optional[str] = None) -> ContextManager:
+    """Context manager timing a phase; a no-op unless profiling is enabled."""
+    if _profiler is None:
+        return _NULL_PHASE
+    return _profiler.phase(name, game)
@@ -0,0 +1,75 @@
+"""
+Precompiled request templates for game API calls.
+
+Headers, URLs and the sign body only depend on the game config and the
+account cookie, so they are built once per game and once per account and
+reused for every request instead of being rebuilt on each call.
+"""
+import json
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple
+from .config import GameConfig
+
+
+def extract_account_id(cookies: str) -> Optional[str]:
+    """Return the account_id value from a cookie string, or None if absent."""
+    try:
+        return cookies.split('account_id=')[1].split(';')[0]
+    except (IndexError, AttributeError):
+        return None
+
+
+class GamePlan:
+    """Immutable per-game request template."""
+
+    __slots__ = ('act_id', 'reward_url', 'role_url', 'info_url', 'sign_url', 'sign_body', 'headers', 'extra_headers')
+
+    def __init__(self, config: GameConfig):
+        self.act_id = config.os_act_id
+        self.reward_url = config.os_reward_url
+        self.role_url = config.os_role_url
+        self.info_url = config.os_info_url
+        self.sign_url = config.os_sign_url
+        self.sign_body = json.dumps({'act_id': config.os_act_id}, ensure_ascii=False)
+        self.headers: Mapping[str, str] = MappingProxyType({
+            'User-Agent': config.wb_user_agent,
+            'Referer': config.os_referer_url,
+            'Accept-Encoding': 'gzip, deflate, br',
+        })
+        # Applied after the Cookie header, so they may override it (same as BaseSign.get_header)
+        self.extra_headers: Mapping[str, str] = MappingProxyType(dict(config.os_headers))
+
+
+_game_plans: Dict[int, Tuple[GameConfig, GamePlan]] = {}
+
+
+def get_game_plan(config: GameConfig) -> GamePlan:
+    """Return the shared GamePlan for config, building it on first use."""
+    cached = _game_plans.get(id(config))
+    if cached is None or cached[0] is not config:
+        cached = (config, GamePlan(config))
+        _game_plans[id(config)] = cached
+    return cached[1]
+
+
+class AccountPlan:
+    """Per-account request template; memoizes the full header set per game."""
+
+    __slots__ = ('cookies', 'account_id', '_headers')
+
+    def __init__(self, cookies: str):
+        self.cookies = cookies
+        self.account_id = extract_account_id(cookies)
+        self._headers: Dict[GamePlan, Mapping[str, str]] = {}
+
+    def headers_for(self, game_plan: GamePlan) -> Mapping[str, str]:
+        """Return the read-only header set for requests to game_plan's endpoints."""
+        headers = self._headers.get(game_plan)
+        if headers is None:
+            headers = MappingProxyType({
+                **game_plan.headers,
+                'Cookie': self.cookies,
+                **game_plan.extra_headers,
+            })
+            self._headers[game_plan] = headers
+        return headers
@@ -0,0 +1,121 @@
+"""
+Work planning and history-aware ordering of (account, game) pairs.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from .config import GAME_CONFIGS, AccountConfig, GameConfig, parse_cookie_string
+from .history import RunHistory
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkItem:
+    """One (account, game) check-in to perform."""
+    account: AccountConfig
+    game_name: str
+    game_config: GameConfig
+
+
+def account_identity(cookies: str) -> str:
+    """
+    Stable HoYoLAB identity of a cookie: ltuid (v1 or v2), else account_id,
+    else the cookie string itself.
+    """
+    fields = parse_cookie_string(cookies)
+    for name in ('ltuid_v2', 'ltuid', 'account_id_v2', 'account_id'):
+        if fields.get(name):
+            return fields[name]
+    return cookies.strip()
+
+
+def merge_accounts(accounts: List[AccountConfig], default_chat_id: Optional[str] = None) -> List[AccountConfig]:
+    """
+    Merge accounts that refer to the same HoYoLAB user.
+
+    The same cookie can be configured twice — e.g. once per game through
+    OS_COOKIE_<GAME> and again as ACCOUNT_<ID>_COOKIES. Duplicates are folded
+    into one account at the position of the first occurrence: enabled games
+    are unioned (in order), the ACCOUNT_<ID> entry's id is kept over legacy
+    ones, and an explicitly configured chat id beats default_chat_id (the
+    ACCOUNT_<ID> entry's one winning a conflict).
+    """
+    groups: Dict[str, List[AccountConfig]] = {}
+    for account in accounts:
+        groups.setdefault(account_identity(account.cookies), []).append(account)
+    return [_merge_group(group, default_chat_id) for group in groups.values()]
+
+
+def _merge_group(group: List[AccountConfig], default_chat_id: Optional[str]) -> AccountConfig:
+    primary = next((a for a in group if not a.legacy), group[0])
+    others = [a for a in group if a is not primary]
+    games: List[str] = []
+    for account in group:
+        games.extend(g for g in account.enabled_games if g not in games)
+    chat_ids = [a.telegram_chat_id for a in (primary, *others) if a.telegram_chat_id]
+    explicit = [c for c in chat_ids if c != default_chat_id]
+    chat_id = (explicit or chat_ids or [None])[0]
+
+    for account in others:
+        added = [g for g in account.enabled_games if g not in primary.enabled_games]
+        logger.info(
+            f"Merged duplicate account {account.account_id} into {primary.account_id}"
+            + (f" (added games: {', '.join(added)})" if added else '')
+        )
+    ignored = sorted(set(explicit) - {chat_id})
+    if ignored:
+        logger.warning(
+            f"Account {primary.account_id} is configured with several Telegram chats;"
+            f" reporting to {chat_id}, not {', '.join(ignored)}"
+        )
+    return AccountConfig(
+        account_id=primary.account_id,
+        cookies=primary.cookies,
+        telegram_chat_id=chat_id,
+        enabled_games=games,
+        legacy=primary.legacy,
+    )
+
+
+def plan_work(accounts: List[AccountConfig]) -> List[WorkItem]:
+    """Expand accounts into work items in configuration order, dropping unknown and repeated games."""
+    items = []
+    for account in accounts:
+        seen = set()
+        for game_name in account.enabled_games:
+            if game_name in seen:
+                continue
+            seen.add(game_name)
+            if game_name not in GAME_CONFIGS:
+                logger.warning(f"Unknown game '{game_name}' — skipping.")
+                continue
+            items.append(WorkItem(account, game_name, GAME_CONFIGS[game_name]))
+    return items
+
+
+def order_work(items: List[WorkItem], history: Optional[RunHistory]) -> List[WorkItem]:
+    """
+    Order work so the pairs most likely to need time run first:
+
+      1. pairs not yet signed in today before pairs history says are done
+      2. flaky pairs / game hosts first, so their retries fit inside the deadline
+      3. historically slow pairs before fast ones, to cut the tail of the run
+
+    Ties keep configuration order.
+    """
+    if history is None:
+        return list(items)
+
+    game_flakiness = {game: history.game_failure_rate(game) for game in {item.game_name for item in items}}
+
+    def priority(item: WorkItem):
+        account_id, game = item.account.account_id, item.game_name
+        flakiness = max(history.failure_rate(account_id, game), game_flakiness[game])
+        return (
+            history.signed_today(account_id, game),
+            -flakiness,
+            -history.expected_duration(account_id, game),
+        )
+
+    return sorted(items, key=priority)
@@ -5,13 +5,10 @@ Uses new configuration system under the hood.
 import logging
 from .config import GAME_CONFIGS, get_app_settings, get_telegram_config, get_proxy_config
 from .http_client import HttpClient
+from .log_setup import setup_logging_from_settings
 
 # Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s %(levelname)s %(message)s',
-    datefmt='%Y-%m-%dT%H:%M:%S'
-)
+setup_logging_from_settings(get_app_settings())
 
 log = logger = logging
 
@@ -1,16 +1,23 @@
 """
 Module for performing check-ins in HoYoverse games.
 """
+import contextvars
 import time
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
-from .http_client import HttpClient
+from typing import Dict, Any, Mapping, Optional
+from .http_client import HttpClient, MIN_ATTEMPT_TIME
+from .deadline import Deadline
 from .config import GameConfig
+from .profiling import profile_phase, run_profiled
+from .request_plan import AccountPlan, get_game_plan
 
 logger = logging.getLogger(__name__)
 
+SIGN_DELAY = 2  # seconds between reading check-in info and the sign POST
+
 
 @dataclass
 class SignResult:
@@ -42,22 +49,24 @@ class SignResult:
 class BaseSign:
     """Base class for working with API."""
 
-    def __init__(self, cookies: str, http_client: Optional[HttpClient] = None):
+    def __init__(
+        self,
+        cookies: str,
+        http_client: Optional[HttpClient] = None,
+        account_plan: Optional[AccountPlan] = None,
+        deadline: Optional[Deadline] = None,
+    ):
         if not isinstance(cookies, str):
             raise TypeError(f'{self.__class__.__name__} expects str, got {type(cookies)}')
         self._cookie = cookies
         self.http_client = http_client or HttpClient()
+        self.account_plan = account_plan or AccountPlan(cookies)
+        # Deadline of the run this check-in belongs to (None: the client's default)
+        self.deadline = deadline or self.http_client.deadline
 
-    def get_header(self, config: GameConfig) -> Dict[str, str]:
-        header = {
-            'User-Agent': config.wb_user_agent,
-            'Referer': config.os_referer_url,
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Cookie': self._cookie,
-        }
-        if config.os_headers:
-            header.update(config.os_headers)
-        return header
+    def get_header(self, config: GameConfig) -> Mapping[str, str]:
+        """Return the prebuilt, read-only header set for config's endpoints."""
+        return self.account_plan.headers_for(get_game_plan(config))
 
 
 class Roles(BaseSign):
@@ -65,14 +74,24 @@ class Roles(BaseSign):
 
     def get_awards(self, config: GameConfig) -> Dict[str, Any]:
         try:
-            response = self.http_client.request('GET', config.os_reward_url, headers=self.get_header(config))
+            response = self.http_client.request(
+                'GET', get_game_plan(config).reward_url,
+                headers=self.get_header(config),
+                cache='reward' in config.cache_endpoints,
+                deadline=self.deadline,
+            )
             return self.http_client.to_python(response.text)
         except json.JSONDecodeError as e:
             raise Exception(f"Error getting awards: {e}") from e
 
     def get_roles(self, config: GameConfig) -> Dict[str, Any]:
         try:
-            response = self.http_client.request('GET', config.os_role_url, headers=self.get_header(config))
+            response = self.http_client.request(
+                'GET', get_game_plan(config).role_url,
+                headers=self.get_header(config),
+                cache='role' in config.cache_endpoints,
+                deadline=self.deadline,
+            )
             data = self.http_client.to_python(response.text)
             retcode = data.get('retcode', 1)
             if retcode != 0 or data.get('data') is None:
@@ -92,10 +111,14 @@ class Sign(BaseSign):
         game_name: str,
         game_config: GameConfig,
         http_client: Optional[HttpClient] = None,
+        account_plan: Optional[AccountPlan] = None,
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(cookies, http_client)
+        super().__init__(cookies, http_client, account_plan, deadline)
         self.game_name = game_name
         self.config = game_config
+        self.plan = get_game_plan(game_config)
+        self._roles = Roles(cookies, self.http_client, self.account_plan, self.deadline)
         self._region_name = ''
         self._uid = ''
         self._level: Any = 0
@@ -112,9 +135,7 @@ class Sign(BaseSign):
             region=self._region_name or 'N/A',
         )
 
-    def get_info(self) -> Dict[str, Any]:
-        roles_handler = Roles(self._cookie, self.http_client)
-        user_game_roles = roles_handler.get_roles(self.config)
+    def _apply_roles(self, user_game_roles: Dict[str, Any]):
         role_list = user_game_roles.get('data', {}).get('list', [])
 
         if not role_list:
@@ -128,28 +149,51 @@ class Sign(BaseSign):
         self._level = role_list[index].get('level', 0)
         self._nick_name = role_list[index].get('nickname', 'N/A')
 
-        try:
-            aid = self._cookie.split('account_id=')[1].split(';')[0]
-            logger.info(f'Checking in for account id {aid}...')
-        except (IndexError, AttributeError):
+        if self.account_plan.account_id is not None:
+            logger.info(f'Checking in for account id {self.account_plan.account_id}...')
+        else:
             logger.warning('Failed to extract account_id from cookies')
 
-        response = self.http_client.request('GET', self.config.os_info_url, headers=self.get_header(self.config))
+    def _profiled(self, phase: str, fn, *args):
+        with profile_phase(phase, self.game_name):
+            return fn(*args)
+
+    def _submit(self, pool: ThreadPoolExecutor, phase: str, fn, *args):
+        # Run in a copy of the caller's context so log account/game fields follow the request
+        return pool.submit(contextvars.copy_context().run, run_profiled, self._profiled, phase, fn, *args)
+
+    def _get_sign_info(self) -> Dict[str, Any]:
+        response = self.http_client.request(
+            'GET', self.plan.info_url, headers=self.get_header(self.config), deadline=self.deadline
+        )
         return self.http_client.to_python(response.text)
 
+    def get_info(self) -> Dict[str, Any]:
+        self._apply_roles(self._roles.get_roles(self.config))
+        return self._get_sign_info()
+
     def run(self) -> SignResult:
         """Perform check-in and return a structured SignResult."""
         try:
-            info = self.get_info()
-            if not info:
-                return self._make_error_result('Error: failed to get check-in info')
-
-            data = info.get('data', {})
-            total_sign_day: int = data.get('total_sign_day', 0)
-            is_sign: bool = data.get('is_sign', False)
-            first_bind: bool = data.get('first_bind', False)
-
-            awards_data = Roles(self._cookie, self.http_client).get_awards(self.config)
+            # Roles, info and awards don't depend on each other — fetch them
+            # concurrently and join before deciding whether to sign.
+            with ThreadPoolExecutor(max_workers=3, thread_name_prefix=f'sign-{self.game_name}') as pool:
+                roles_future = self._submit(pool, 'roles', self._roles.get_roles, self.config)
+                info_future = self._submit(pool, 'info', self._get_sign_info)
+                awards_future = self._submit(pool, 'awards', self._roles.get_awards, self.config)
+
+                # Joined in the original sequential order so errors surface the same way
+                self._apply_roles(roles_future.result())
+                info = info_future.result()
+                if not info:
+                    return self._make_error_result('Error: failed to get check-in info')
+
+                data = info.get('data', {})
+                total_sign_day: int = data.get('total_sign_day', 0)
+                is_sign: bool = data.get('is_sign', False)
+                first_bind: bool = data.get('first_bind', False)
+
+                awards_data = awards_future.result()
             awards = awards_data.get('data', {}).get('awards', [])
 
             ar = int(self._level) if str(self._level).isdigit() else 0
@@ -177,13 +221,18 @@ class Sign(BaseSign):
 
             reward_name, reward_count = reward_at(total_sign_day)
 
-            time.sleep(2)  # brief delay before the POST to appear more human-like
+            if self.deadline is not None:
+                self.deadline.check(SIGN_DELAY + MIN_ATTEMPT_TIME)
+            with profile_phase('sleep', self.game_name):
+                time.sleep(SIGN_DELAY)  # brief delay before the POST to appear more human-like
             try:
-                response = self.http_client.request(
-                    'POST', self.config.os_sign_url,
-                    headers=self.get_header(self.config),
-                    data=json.dumps({'act_id': self.config.os_act_id}, ensure_ascii=False),
-                )
+                with profile_phase('sign', self.game_name):
+                    response = self.http_client.request(
+                        'POST', self.plan.sign_url,
+                        headers=self.get_header(self.config),
+                        data=self.plan.sign_body,
+                        deadline=self.deadline,
+                    )
                 result = self.http_client.to_python(response.text)
                 code = result.get('retcode', 99999)
 
@@ -0,0 +1,73 @@
+"""
+Compiled message templates for notifications.
+
+Templates are parsed once into literal / field parts; rendering then only
+formats the substituted values, HTML-escaping them so player names or API
+messages containing <, > or & can't break Telegram's HTML parse mode.
+"""
+import html
+import logging
+from string import Formatter
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_formatter = Formatter()
+
+
+class CompiledTemplate:
+    """A str.format()-style template parsed once and rendered many times."""
+
+    __slots__ = ('source', 'variables', 'unknown_variables', '_parts', '_escape')
+
+    def __init__(self, source: str, allowed: Optional[Iterable[str]] = None, escape: bool = True):
+        """
+        Args:
+            source: Template text using {name} / {name:spec} / {name!r} fields.
+            allowed: Variable names the template may use. Unknown names are
+                     rendered as-is ("{name}") and listed in unknown_variables.
+            escape: HTML-escape substituted values (template text is left untouched).
+        """
+        self.source = source
+        self._escape = escape
+        # (literal, field_name, format_spec, conversion, placeholder)
+        self._parts: List[Tuple[str, Optional[str], str, Optional[str], str]] = []
+        variables = []
+        for literal, field_name, format_spec, conversion in _formatter.parse(source):
+            placeholder = ''
+            if field_name is not None:
+                placeholder = '{' + field_name + '}'
+                if field_name not in variables:
+                    variables.append(field_name)
+            self._parts.append((literal, field_name, format_spec or '', conversion, placeholder))
+        self.variables: Tuple[str, ...] = tuple(variables)
+        allowed_set = set(allowed) if allowed is not None else None
+        self.unknown_variables: Tuple[str, ...] = tuple(
+            v for v in self.variables
+            if allowed_set is not None and v.split('.')[0].split('[')[0] not in allowed_set
+        )
+
+    def validate(self, name: str) -> bool:
+        """Log a warning for every unknown variable. Returns True if there are none."""
+        for variable in self.unknown_variables:
+            logger.warning(f"{name}: unknown template variable '{{{variable}}}' will be shown as-is")
+        return not self.unknown_variables
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Substitute values; missing variables are left in place as "{name}"."""
+        out = []
+        for literal, field_name, format_spec, conversion, placeholder in self._parts:
+            if literal:
+                out.append(literal)
+            if field_name is None:
+                continue
+            try:
+                value, _ = _formatter.get_field(field_name, (), values)
+            except (KeyError, AttributeError, IndexError):
+                out.append(placeholder)
+                continue
+            if conversion:
+                value = _formatter.convert_field(value, conversion)
+            text = format(value, format_spec)
+            out.append(html.escape(text, quote=False) if self._escape else text)
+        return ''.join(out)
@@ -0,0 +1,129 @@
+"""
+HTTP transport backends used by HttpClient.
+
+  requests — HTTP/1.1 via a pooled requests.Session (default, always available)
+  httpx    — HTTP/2 via httpx + h2: concurrent requests to one host are
+             multiplexed over a single connection. Needs ``pip install
+             "httpx[http2,socks]"``.
+"""
+import logging
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+TRANSPORTS = ('requests', 'httpx')
+
+
+def _no_cookie_policy() -> DefaultCookiePolicy:
+    # Transports are shared by every account — never persist Set-Cookie
+    # responses, each request carries its own Cookie header.
+    return DefaultCookiePolicy(allowed_domains=[])
+
+
+class Transport:
+    """Sends single HTTP requests; retries, caching and deadlines live in HttpClient."""
+
+    name = 'transport'
+
+    def request(self, method: str, url: str, timeout: float, params: Optional[Dict] = None,
+                data: Optional[Any] = None, json: Optional[Any] = None,
+                headers: Optional[Dict[str, str]] = None, **kwargs) -> Any:
+        """Send one request and return the backend's response object."""
+        raise NotImplementedError
+
+    def raise_for_status(self, response: Any):
+        """Raise for 4xx / 5xx responses (304 Not Modified must not raise)."""
+        raise NotImplementedError
+
+    def head(self, url: str, timeout: float):
+        """HEAD without following redirects — used to open pooled connections."""
+        return self.request('HEAD', url, timeout)
+
+    def close(self):
+        pass
+
+
+class RequestsTransport(Transport):
+    """HTTP/1.1 over a pooled requests.Session."""
+
+    name = 'requests'
+
+    def __init__(self, proxy: Optional[Dict[str, str]] = None, pool_size: int = 10):
+        self.session = requests.Session()
+        self.session.cookies.set_policy(_no_cookie_policy())
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if proxy:
+            self.session.proxies = proxy
+
+    def request(self, method, url, timeout, params=None, data=None, json=None, headers=None, **kwargs):
+        return self.session.request(
+            method=method, url=url, params=params, data=data, json=json,
+            headers=headers, timeout=timeout, **kwargs
+        )
+
+    def raise_for_status(self, response):
+        response.raise_for_status()
+
+    def head(self, url, timeout):
+        return self.session.head(url, timeout=timeout, allow_redirects=False)
+
+    def close(self):
+        self.session.close()
+
+
+class HttpxTransport(Transport):
+    """HTTP/2 (with HTTP/1.1 fallback) over one multiplexed httpx.Client."""
+
+    name = 'httpx'
+
+    def __init__(self, proxy: Optional[Dict[str, str]] = None, pool_size: int = 10, http2: bool = True):
+        import httpx  # optional dependency
+
+        options = dict(
+            http2=http2,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            cookies=CookieJar(policy=_no_cookie_policy()),
+        )
+        proxy_url = (proxy or {}).get('https') or (proxy or {}).get('http')
+        try:
+            self.client = httpx.Client(proxy=proxy_url, **options)
+        except TypeError:  # httpx < 0.26
+            self.client = httpx.Client(proxies=proxy_url, **options)
+
+    def request(self, method, url, timeout, params=None, data=None, json=None, headers=None, **kwargs):
+        if isinstance(data, (str, bytes)):
+            kwargs['content'] = data  # httpx wants raw bodies as content=
+            data = None
+        return self.client.request(
+            method, url, params=params, data=data, json=json,
+            headers=headers, timeout=timeout, **kwargs
+        )
+
+    def raise_for_status(self, response):
+        if response.status_code >= 400:
+            response.raise_for_status()
+
+    def close(self):
+        self.client.close()
+
+
+def create_transport(name: str = 'requests', proxy: Optional[Dict[str, str]] = None,
+                     pool_size: int = 10, http2: bool = True) -> Transport:
+    """
+    Build a transport by name. Falls back to requests (with a warning) when
+    the httpx backend's optional dependencies are not installed.
+    """
+    if name == 'httpx':
+        try:
+            return HttpxTransport(proxy, pool_size, http2)
+        except ImportError as e:
+            logger.warning(f"httpx transport unavailable ({e}); falling back to requests. "
+                           f'Install it with: pip install "httpx[http2,socks]"')
+    elif name != 'requests':
+        logger.warning(f"Unknown HTTP transport '{name}'; using requests")
+    return RequestsTransport(proxy, pool_size)
@@ -0,0 +1,73 @@
+"""
+DNS pre-resolution and connection warm-up before the sign window.
+"""
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+from .config import GameConfig
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_ORIGIN = 'https://api.telegram.org'
+
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, Tuple[float, list]] = {}
+_dns_lock = threading.Lock()
+_dns_ttl = 300.0
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        _dns_cache[key] = (now + _dns_ttl, result)
+    return result
+
+
+def install_dns_cache(ttl: float = 300):
+    """Route socket.getaddrinfo through a process-wide cache with the given TTL (seconds)."""
+    global _dns_ttl
+    _dns_ttl = ttl
+    socket.getaddrinfo = _cached_getaddrinfo
+
+
+def collect_origins(game_configs: Dict[str, GameConfig], include_telegram: bool = True) -> List[str]:
+    """Return the distinct scheme://host origins used by the given game configs."""
+    origins = []
+    for config in game_configs.values():
+        for url in (config.os_role_url, config.os_info_url, config.os_reward_url, config.os_sign_url):
+            parts = urlsplit(url)
+            origin = f'{parts.scheme}://{parts.netloc}'
+            if origin not in origins:
+                origins.append(origin)
+    if include_telegram:
+        origins.append(TELEGRAM_ORIGIN)
+    return origins
+
+
+def prefetch_dns(origins: Iterable[str]):
+    """Resolve every origin's host in parallel so later connects hit the DNS cache."""
+    # Same family urllib3 asks for, so the cache keys match its lookups
+    from urllib3.util.connection import allowed_gai_family
+
+    def resolve(origin: str):
+        parts = urlsplit(origin)
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        try:
+            socket.getaddrinfo(parts.hostname, port, allowed_gai_family(), socket.SOCK_STREAM)
+        except OSError as e:
+            logger.warning(f'DNS pre-resolution failed for {parts.hostname}: {e}')
+
+    origins = list(origins)
+    if origins:
+        with ThreadPoolExecutor(max_workers=len(origins), thread_name_prefix='dns') as pool:
+            list(pool.map(resolve, origins))
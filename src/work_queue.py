@@ -0,0 +1,242 @@
+"""
+Durable work queue for multi-process runs (QUEUE_WORKERS > 0).
+
+The coordinator enqueues one job per planned game / account pair; worker
+processes claim jobs under a time-limited lease and write results back, and
+the coordinator reads them for the notification step. Jobs only reference
+accounts by id — cookies never leave the config.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from .scheduler import WorkItem
+from .sign import SignResult
+
+logger = logging.getLogger(__name__)
+
+# Finished runs are purged from the queue after this many seconds
+KEEP_RUNS_FOR = 7 * 24 * 3600
+
+
+@dataclass
+class Job:
+    """One claimed game / account pair."""
+    id: int
+    run_id: str
+    position: int
+    account_id: str
+    game: str
+    attempts: int
+
+
+class WorkQueue:
+    """
+    Queue interface used by the coordinator and the workers.
+
+    SqliteWorkQueue is the bundled backend; another store (e.g. a Redis-compatible
+    server for workers on several machines) only has to implement these methods.
+    """
+
+    def enqueue(self, run_id: str, items: List[WorkItem]):
+        """Add the pairs of a run, in the order they should be claimed."""
+        raise NotImplementedError
+
+    def claim(self, run_id: str, worker_id: str, lease: float) -> Optional[Job]:
+        """Lease the next queued (or lease-expired) job of the run, or None."""
+        raise NotImplementedError
+
+    def renew(self, job: Job, worker_id: str, lease: float) -> bool:
+        """
+        Extend the lease worker_id holds on job by lease seconds from now.
+        False if the job is no longer leased to this worker.
+        """
+        raise NotImplementedError
+
+    def complete(self, job: Job, result: SignResult, duration: Optional[float] = None):
+        """
+        Store a job's result; the first result stored for a job wins.
+        duration is None when the pair was skipped rather than run.
+        """
+        raise NotImplementedError
+
+    def unfinished(self, run_id: str) -> int:
+        """Number of jobs of the run without a result."""
+        raise NotImplementedError
+
+    def results(self, run_id: str) -> Dict[int, Tuple[SignResult, Optional[float]]]:
+        """(result, duration) of every finished job of the run, by position."""
+        raise NotImplementedError
+
+    def abandon(self, run_id: str, status: str):
+        """Give every unfinished job of the run a failed result with this status."""
+        raise NotImplementedError
+
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    WorkQueue in a local SQLite database (WAL mode), shared by processes on one machine.
+
+    A job whose lease expires (its worker died or hung) is handed to the next
+    worker that asks; after max_attempts leases it is failed instead. Leases
+    are wall-clock times from clock (time.time; tests can pass their own).
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.clock = clock
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with closing(sqlite3.connect(path, timeout=30, isolation_level=None)) as db:
+            # Readers don't block the writer; must be set outside a transaction
+            db.execute('PRAGMA journal_mode=WAL')
+        with self._transaction() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' run_id TEXT NOT NULL,'
+                ' position INTEGER NOT NULL,'
+                ' account_id TEXT NOT NULL,'
+                ' game TEXT NOT NULL,'
+                " state TEXT NOT NULL DEFAULT 'queued',"  # queued | leased | done
+                ' worker TEXT,'
+                ' lease_until REAL,'
+                ' attempts INTEGER NOT NULL DEFAULT 0,'
+                ' result TEXT,'
+                ' duration REAL,'
+                ' updated_at REAL NOT NULL)'
+            )
+            db.execute('CREATE INDEX IF NOT EXISTS jobs_run_state ON jobs (run_id, state, id)')
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation: safe across threads and processes
+        with closing(sqlite3.connect(self.path, timeout=30, isolation_level=None)) as db:
+            db.execute('BEGIN IMMEDIATE')
+            try:
+                yield db
+            except BaseException:
+                db.execute('ROLLBACK')
+                raise
+            db.execute('COMMIT')
+
+    @staticmethod
+    def _dump(result: SignResult) -> str:
+        return json.dumps(asdict(result), ensure_ascii=False)
+
+    def enqueue(self, run_id, items):
+        now = self.clock()
+        with self._transaction() as db:
+            db.execute("DELETE FROM jobs WHERE state = 'done' AND updated_at < ?", (now - KEEP_RUNS_FOR,))
+            db.executemany(
+                'INSERT INTO jobs (run_id, position, account_id, game, updated_at) VALUES (?, ?, ?, ?, ?)',
+                [(run_id, i, item.account.account_id, item.game_name, now) for i, item in enumerate(items)],
+            )
+
+    def claim(self, run_id, worker_id, lease):
+        now = self.clock()
+        with self._transaction() as db:
+            exhausted = db.execute(
+                "SELECT id, game, attempts FROM jobs WHERE run_id = ? AND state = 'leased'"
+                ' AND lease_until < ? AND attempts >= ?',
+                (run_id, now, self.max_attempts),
+            ).fetchall()
+            for job_id, game, attempts in exhausted:
+                logger.error(f"Job {job_id} ({game}) lost its worker {attempts} times — giving up")
+                result = SignResult(game=game, success=False, status=f'Error: worker lost the job {attempts} times')
+                db.execute(
+                    "UPDATE jobs SET state = 'done', result = ?, updated_at = ? WHERE id = ?",
+                    (self._dump(result), now, job_id),
+                )
+
+            row = db.execute(
+                'SELECT id, position, account_id, game, attempts FROM jobs WHERE run_id = ?'
+                " AND (state = 'queued' OR (state = 'leased' AND lease_until < ?))"
+                ' ORDER BY id LIMIT 1',
+                (run_id, now),
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, position, account_id, game, attempts = row
+            if attempts:
+                logger.warning(f"Re-leasing job {job_id} ({game} / account {account_id}) after an expired lease")
+            db.execute(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1,"
+                ' updated_at = ? WHERE id = ?',
+                (worker_id, now + lease, now, job_id),
+            )
+        return Job(job_id, run_id, position, account_id, game, attempts + 1)
+
+    def renew(self, job, worker_id, lease):
+        now = self.clock()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+                (now + lease, now, job.id, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job, result, duration=None):
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET state = 'done', result = ?, duration = ?, updated_at = ?"
+                " WHERE id = ? AND state != 'done'",
+                (self._dump(result), None if duration is None else round(duration, 3), self.clock(), job.id),
+            )
+
+    def unfinished(self, run_id):
+        with self._transaction() as db:
+            return db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND state != 'done'", (run_id,)
+            ).fetchone()[0]
+
+    def results(self, run_id):
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT position, result, duration FROM jobs WHERE run_id = ? AND state = 'done'", (run_id,)
+            ).fetchall()
+        return {position: (SignResult(**json.loads(result)), duration) for position, result, duration in rows}
+
+    def abandon(self, run_id, status):
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, game FROM jobs WHERE run_id = ? AND state != 'done'", (run_id,)
+            ).fetchall()
+            for job_id, game in rows:
+                db.execute(
+                    "UPDATE jobs SET state = 'done', result = ?, updated_at = ? WHERE id = ?",
+                    (self._dump(SignResult(game=game, success=False, status=status)), self.clock(), job_id),
+                )
+
+
+@contextmanager
+def keep_leased(queue: WorkQueue, job: Job, worker_id: str, lease: float) -> Iterator[None]:
+    """
+    Renew job's lease every lease / 3 seconds while the block runs, so a slow
+    but live worker keeps its job and it is only handed on once the worker dies.
+    """
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(lease / 3):
+            try:
+                renewed = queue.renew(job, worker_id, lease)
+            except sqlite3.Error as e:
+                logger.warning(f"{worker_id}: could not renew the lease on job {job.id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"{worker_id}: lost the lease on job {job.id} ({job.game})")
+                return
+
+    thread = threading.Thread(target=heartbeat, name=f'lease-{job.id}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
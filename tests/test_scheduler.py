@@ -0,0 +1,50 @@
+import os
+import pytest
+from src import config
+from src.scheduler import merge_accounts
+
+COOKIE = 'ltuid=123; ltoken=abc; account_id=123; cookie_token=def'
+
+
+@pytest.fixture
+def env(monkeypatch):
+    for key in list(os.environ):
+        if key.startswith(('ACCOUNT_', 'OS_COOKIE_')):
+            monkeypatch.delenv(key)
+    monkeypatch.setattr(config, '_app_settings', config.AppSettings(default_chat_id='999'))
+    return monkeypatch
+
+
+def test_legacy_entry_folds_into_account_entry(env):
+    env.setenv('OS_COOKIE_HSR', COOKIE)
+    env.setenv('ACCOUNT_MAIN_COOKIES', COOKIE)
+    env.setenv('ACCOUNT_MAIN_TELEGRAM_CHAT_ID', '555')
+    env.setenv('ACCOUNT_MAIN_ENABLED_GAMES', 'Genshin,ZZZ')
+
+    [account] = merge_accounts(config.load_accounts(), '999')
+
+    assert account.account_id == 'MAIN'
+    assert account.telegram_chat_id == '555'
+    assert account.enabled_games == ['HSR', 'Genshin', 'ZZZ']
+
+
+def test_conflicting_chat_ids_keep_the_account_entry(env, caplog):
+    env.setenv('OS_COOKIE_HSR', COOKIE)
+    env.setenv('ACCOUNT_123_TELEGRAM_CHAT_ID', '111')  # explicit chat for the legacy entry
+    env.setenv('ACCOUNT_MAIN_COOKIES', COOKIE)
+    env.setenv('ACCOUNT_MAIN_TELEGRAM_CHAT_ID', '555')
+
+    [account] = merge_accounts(config.load_accounts(), '999')
+
+    assert (account.account_id, account.telegram_chat_id) == ('MAIN', '555')
+    assert 'not 111' in caplog.text
+
+
+def test_explicit_legacy_chat_beats_default(env):
+    env.setenv('OS_COOKIE_HSR', COOKIE)
+    env.setenv('ACCOUNT_123_TELEGRAM_CHAT_ID', '111')
+    env.setenv('ACCOUNT_MAIN_COOKIES', COOKIE)
+
+    [account] = merge_accounts(config.load_accounts(), '999')
+
+    assert (account.account_id, account.telegram_chat_id) == ('MAIN', '111')
@@ -0,0 +1,63 @@
+import threading
+from types import SimpleNamespace
+from src.work_queue import Job, SqliteWorkQueue, WorkQueue, keep_leased
+
+LEASE = 10.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_queue(tmp_path, clock):
+    queue = SqliteWorkQueue(str(tmp_path / 'queue.sqlite3'), clock=clock)
+    queue.enqueue('run', [SimpleNamespace(account=SimpleNamespace(account_id='1'), game_name='genshin')])
+    return queue
+
+
+def test_slow_live_worker_keeps_its_job(tmp_path):
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    job = queue.claim('run', 'w1', LEASE)
+    assert job is not None
+
+    # The pair runs for several leases, renewing as the heartbeat would
+    for _ in range(5):
+        clock.now += LEASE * 0.9
+        assert queue.renew(job, 'w1', LEASE)
+        assert queue.claim('run', 'w2', LEASE) is None
+
+
+def test_job_of_dead_worker_is_taken_over(tmp_path):
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    job = queue.claim('run', 'w1', LEASE)
+
+    # No renewal: the worker died
+    clock.now += LEASE + 1
+    taken = queue.claim('run', 'w2', LEASE)
+    assert taken is not None and taken.id == job.id and taken.attempts == 2
+    assert not queue.renew(job, 'w1', LEASE)
+
+
+class RecordingQueue(WorkQueue):
+    def __init__(self):
+        self.renewed = threading.Event()
+
+    def renew(self, job, worker_id, lease):
+        self.renewed.set()
+        return True
+
+
+def test_keep_leased_renews_until_the_block_ends():
+    queue = RecordingQueue()
+    job = Job(1, 'run', 0, '1', 'genshin', 1)
+    with keep_leased(queue, job, 'w1', 0.3):
+        assert queue.renewed.wait(10)
+    queue.renewed.clear()
+    # The heartbeat thread is joined on exit, so nothing renews afterwards
+    assert not queue.renewed.wait(0.3)